@@ -1,133 +1,178 @@
+import argparse
+import json
+import time
+from datetime import datetime
+
+import numpy as np
 import pyaudio
-import struct
-import math
 
-print("🎤 Audio Device Diagnostic Tool\n")
-print("=" * 50)
+from Test_Room_Ai import AUDIO_PROFILE_FILE, CHUNK, SAMPLE_RATE
+
+# Mic calibration and latency profiler. For every input device (or just --device): noise floor while you
+# stay quiet, speech level while you talk, then read latency and jitter at several buffer sizes. The best
+# device, a silence threshold between its noise and speech levels, and the smallest buffer that reads
+# smoothly go into AUDIO_PROFILE_FILE, which Arthur loads at startup instead of MIC_INDEX/SILENCE_THRESH/CHUNK.
+#
+# Usage: python Audio_test.py [--device 1] [--seconds 3] [--buffers 256 512 1024 2048] [--dry-run]
+
+parser = argparse.ArgumentParser(description="Arthur mic calibration and latency profiler")
+parser.add_argument("--device", type=int, help="only profile this device index")
+parser.add_argument("--seconds", type=float, default=3.0, help="length of the quiet and the speech takes")
+parser.add_argument("--buffers", type=int, nargs="+", default=[256, 512, 1024, 2048])
+parser.add_argument("--output", default=AUDIO_PROFILE_FILE)
+parser.add_argument("--dry-run", action="store_true", help="print the profile without writing it")
+args = parser.parse_args()
+
+
+def record(stream, seconds, chunk=CHUNK):
+    """int16 samples from an open stream"""
+    data = b"".join(stream.read(chunk, exception_on_overflow=False)
+                    for _ in range(max(1, int(seconds * SAMPLE_RATE / chunk))))
+    return np.frombuffer(data, dtype=np.int16)
+
+
+def chunk_rms(samples, chunk=CHUNK):
+    """RMS of every chunk, in one pass"""
+    frames = samples[:len(samples) // chunk * chunk].astype(np.float32).reshape(-1, chunk)
+    return np.sqrt(np.mean(frames * frames, axis=1))
 
-pa = pyaudio.PyAudio()
 
-# List all audio devices
-print("\n📋 Available Audio Devices:\n")
-info = pa.get_host_api_info_by_index(0)
-numdevices = info.get('deviceCount')
+def meter(samples, label):
+    levels = chunk_rms(samples)
+    print(f"   {label:<7} {'█' * min(int(np.percentile(levels, 75) / 100), 50)} "
+          f"p50 {np.median(levels):.0f}  p90 {np.percentile(levels, 90):.0f}  max {levels.max():.0f}")
+    return levels
 
-input_devices = []
 
-for i in range(0, numdevices):
+def read_timing(pa, device, size, seconds=1.5):
+    """Interval between reads of `size` frames vs the ideal size / rate, plus overflows"""
+    stream = pa.open(format=pyaudio.paInt16, channels=1, rate=SAMPLE_RATE, input=True,
+                     frames_per_buffer=size, input_device_index=device)
     try:
-        device_info = pa.get_device_info_by_host_api_device_index(0, i)
-        device_name = device_info.get('name')
-        max_input_channels = device_info.get('maxInputChannels')
-        
-        if max_input_channels > 0:
-            input_devices.append(i)
-            print(f"   [{i}] {device_name}")
-            print(f"       Channels: {max_input_channels}")
-            print(f"       Sample Rate: {int(device_info.get('defaultSampleRate'))} Hz")
-            print()
-    except Exception as e:
-        continue
+        stream.read(size, exception_on_overflow=False)  # The first read includes stream start-up
+        stamps, overflows = [time.perf_counter()], 0
+        for _ in range(max(2, int(seconds * SAMPLE_RATE / size))):
+            try:
+                stream.read(size, exception_on_overflow=True)
+            except IOError:
+                overflows += 1
+            stamps.append(time.perf_counter())
+        input_latency = stream.get_input_latency()
+    finally:
+        stream.stop_stream()
+        stream.close()
+
+    intervals = np.diff(stamps) * 1000
+    period = size / SAMPLE_RATE * 1000
+    return {
+        "period_ms": round(period, 1),
+        "input_latency_ms": round(input_latency * 1000, 1),
+        "interval_p50_ms": round(float(np.median(intervals)), 2),
+        "jitter_ms": round(float(np.std(intervals)), 2),
+        "worst_late_ms": round(float(intervals.max() - period), 2),
+        "overflows": overflows,
+    }
+
+
+def smooth(timing):
+    """Reads arrive on time: no overflows and no read late by more than half a period"""
+    return timing["overflows"] == 0 and timing["worst_late_ms"] < timing["period_ms"] / 2
+
+
+print("🎤 Audio Calibration & Latency Profiler\n")
+print("=" * 60)
 
-if not input_devices:
+pa = pyaudio.PyAudio()
+devices = []
+for i in range(pa.get_device_count()):
+    info = pa.get_device_info_by_index(i)
+    if info.get("maxInputChannels", 0) > 0 and args.device in (None, i):
+        devices.append((i, info.get("name", "")))
+        print(f"   [{i}] {info.get('name')} ({info.get('maxInputChannels')} ch, "
+              f"{int(info.get('defaultSampleRate', 0))} Hz)")
+
+if not devices:
     print("❌ No input devices found!")
     pa.terminate()
     exit(1)
 
-print("=" * 50)
-print(f"\n✅ Found {len(input_devices)} input device(s)")
-
-# Show default device
-try:
-    default_device = pa.get_default_input_device_info()
-    default_index = default_device['index']
-    print(f"\n⭐ Default microphone: [{default_index}] {default_device['name']}")
-except:
-    print("\n⚠️ Could not determine default microphone")
-
-# Test default device
-print("\n🔍 Testing Default Microphone...\n")
-
-try:
-    # Try to open default device
-    stream = pa.open(
-        format=pyaudio.paInt16,
-        channels=1,
-        rate=16000,
-        input=True,
-        frames_per_buffer=512,
-        input_device_index=None  # Use default
-    )
-    
-    print("✅ Default microphone opened successfully!")
-    print("🎙️ Speak into your microphone for 3 seconds...")
-    print("   (Testing audio level detection)\n")
-    
-    # Read audio for 3 seconds and check levels
-    max_amplitude = 0
-    total_samples = 0
-    
-    for i in range(0, int(16000 / 512 * 3)):  # 3 seconds
+results = []
+for index, name in devices:
+    print("\n" + "=" * 60)
+    print(f"\n🔍 [{index}] {name}\n")
+    try:
+        stream = pa.open(format=pyaudio.paInt16, channels=1, rate=SAMPLE_RATE, input=True,
+                         frames_per_buffer=CHUNK, input_device_index=index)
+    except Exception as e:
+        print(f"   ⚠️ Can't open at {SAMPLE_RATE} Hz mono: {e}")
+        continue
+
+    try:
+        input(f"   🤫 Stay quiet for {args.seconds:.0f}s, press Enter to start...")
+        noise = meter(record(stream, args.seconds), "quiet")
+        input(f"   🗣️ Now talk normally for {args.seconds:.0f}s, press Enter to start...")
+        speech = meter(record(stream, args.seconds), "speech")
+    finally:
+        stream.stop_stream()
+        stream.close()
+
+    noise_rms = float(np.percentile(noise, 90))
+    speech_rms = float(np.percentile(speech, 75))  # Upper quartile, the take has pauses between words
+    snr = 20 * np.log10(max(speech_rms, 1.0) / max(noise_rms, 1.0))
+
+    print("\n   ⏱️ Read timing:")
+    timings = {}
+    for size in args.buffers:
         try:
-            data = stream.read(512, exception_on_overflow=False)
-            
-            # Calculate amplitude
-            audio_data = struct.unpack(str(512) + 'h', data)
-            amplitude = sum(abs(x) for x in audio_data) / len(audio_data)
-            max_amplitude = max(max_amplitude, amplitude)
-            total_samples += 1
-            
-            # Visual feedback
-            if i % 10 == 0:  # Update every ~0.3 seconds
-                bars = int(amplitude / 100)
-                print(f"   Volume: {'█' * min(bars, 50)} {int(amplitude)}", end='\r')
-                
+            timings[size] = t = read_timing(pa, index, size)
         except Exception as e:
-            print(f"\n⚠️ Read error: {e}")
-            break
-    
-    stream.stop_stream()
-    stream.close()
-    
-    print("\n")
-    print("=" * 50)
-    print("\n📊 Results:")
-    print(f"   Max amplitude detected: {int(max_amplitude)}")
-    
-    if max_amplitude < 10:
-        print("\n❌ PROBLEM: Very low audio levels detected!")
-        print("   Possible issues:")
-        print("   • Microphone is muted")
-        print("   • Wrong microphone selected")
-        print("   • Microphone not plugged in")
-        print("   • Microphone permissions not granted")
-        print("\n   💡 Try:")
-        print("   • Check Windows Sound Settings")
-        print("   • Ensure microphone is selected as default recording device")
-        print("   • Test microphone in Windows Settings > System > Sound")
-    elif max_amplitude < 100:
-        print("\n⚠️ WARNING: Low audio levels")
-        print("   • Microphone might be too far away")
-        print("   • Try speaking louder")
-        print("   • Check microphone volume in Windows settings")
-    else:
-        print("\n✅ Good audio levels detected!")
-        print("   Your microphone is working properly!")
-    
-except Exception as e:
-    print(f"\n❌ Failed to open default microphone: {e}")
-    print("\n🔧 Troubleshooting:")
-    print("   • Check if microphone is connected")
-    print("   • Grant microphone permissions to Python")
-    print("   • Try running as Administrator")
-    print("   • Check Windows Privacy Settings > Microphone")
+            print(f"      {size:>5} frames  ⚠️ {e}")
+            continue
+        print(f"      {size:>5} frames ({t['period_ms']:>5.1f}ms)  interval {t['interval_p50_ms']:>6.2f}ms  "
+              f"jitter {t['jitter_ms']:>5.2f}ms  worst late {t['worst_late_ms']:>6.2f}ms  "
+              f"overflows {t['overflows']}  input latency {t['input_latency_ms']}ms"
+              f"{'' if smooth(t) else '  ⚠️'}")
+
+    print(f"\n   📊 Noise {noise_rms:.0f}, speech {speech_rms:.0f}, SNR {snr:.1f} dB")
+    if speech_rms < 10:
+        print("   ❌ Next to nothing picked up: muted, unplugged, or no mic permission for Python?")
+    elif speech_rms < 100:
+        print("   ⚠️ Low speech level: mic too far away or its input volume too low")
+    results.append({"index": index, "name": name, "noise": noise_rms, "speech": speech_rms, "snr": snr,
+                    "timings": timings})
 
 pa.terminate()
+print("\n" + "=" * 60)
+
+usable = [r for r in results if r["speech"] >= 100 and r["timings"]] or [r for r in results if r["timings"]]
+if not usable:
+    print("\n❌ No device could be profiled")
+    exit(1)
+
+best = max(usable, key=lambda r: r["snr"])
+# Halfway between noise and speech on a log scale, and never inside the noise
+threshold = max(np.sqrt(best["noise"] * best["speech"]), best["noise"] * 2, 50.0)
+smooth_sizes = [size for size, t in sorted(best["timings"].items()) if smooth(t)]
+chunk = smooth_sizes[0] if smooth_sizes else max(best["timings"])
+
+profile = {
+    "mic_index": best["index"],
+    "mic_name": best["name"],
+    "silence_thresh": round(float(threshold)),
+    "chunk": chunk,
+    "noise_rms": round(best["noise"], 1),
+    "speech_rms": round(best["speech"], 1),
+    "snr_db": round(float(best["snr"]), 1),
+    "latency": {str(size): t for size, t in best["timings"].items()},
+    "calibrated": datetime.now().isoformat(timespec="seconds"),
+}
 
-print("\n" + "=" * 50)
-print("\n💡 To use a specific device in Arthur:")
-print("   In your Arthur code, change:")
-print("   MICROPHONE_INDEX = None")
-print("   To:")
-print("   MICROPHONE_INDEX = X  # Where X is your device number from above")
-print("\n" + "=" * 50)
\ No newline at end of file
+print(f"\n✅ Best mic: [{best['index']}] {best['name']} (SNR {best['snr']:.1f} dB)")
+print(f"   Silence threshold {profile['silence_thresh']}, chunk {chunk} frames ({chunk / SAMPLE_RATE * 1000:.0f}ms)")
+if args.dry_run:
+    print(f"\n{json.dumps(profile, indent=2)}")
+else:
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    print(f"\n💾 Saved to {args.output}, Arthur picks it up on the next start")
+print("\n" + "=" * 60)
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from Mock_llm import start_mock_server
+
+# Batch runner: every prompt in a file goes through ask() (commands, custom responses, cache, LLM) on a
+# pool of worker threads, each item with its own empty history. Results stream to a JSONL file as they
+# finish, then throughput and latency percentiles are printed. Good for persona/command regression runs.
+#
+# Usage: python Batch_run.py prompts.txt [-o results.jsonl] [--workers 4] [--backend ollama] [--mock]
+# Input is one prompt per line (blank lines and # comments skipped) or JSONL with a "prompt" field and an
+# optional "id". Without --mock it talks to the real backend (OPENAI_API_KEY or `ollama serve`).
+
+parser = argparse.ArgumentParser(description="Arthur batch prompt runner")
+parser.add_argument("input", help="text file (one prompt per line) or JSONL with {\"prompt\": ...}")
+parser.add_argument("-o", "--output", default="batch_results.jsonl")
+parser.add_argument("--workers", type=int, default=4)
+parser.add_argument("--backend", choices=["openai", "ollama"], default="ollama")
+parser.add_argument("--mock", action="store_true", help="answer from Mock_llm.py instead of a real backend")
+parser.add_argument("--first-token-ms", type=float, default=300.0)
+parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+parser.add_argument("--verbose", action="store_true", help="keep Arthur's own console output")
+args = parser.parse_args()
+
+if args.mock:
+    mock, mock_url = start_mock_server(args.first_token_ms, args.tokens_per_sec)
+    os.environ["OPENAI_BASE_URL"] = f"{mock_url}/v1"
+    os.environ["OLLAMA_HOST"] = mock_url
+    if args.backend == "openai":
+        os.environ["OPENAI_API_KEY"] = "mock"
+if args.backend == "ollama":
+    os.environ.pop("OPENAI_API_KEY", None)
+
+import Test_Room_Ai as arthur
+
+
+def load_items(path):
+    """[(id, prompt)] from a text or JSONL file"""
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                item = json.loads(line)
+                items.append((item.get("id", n), item["prompt"]))
+            else:
+                items.append((n, line))
+    return items
+
+
+def run_item(item_id, prompt):
+    """One prompt on a fresh session, returns its result record"""
+    session = assistant.new_session(f"batch-{item_id}")
+    arthur.metrics.new_turn()
+    start = time.perf_counter()
+    try:
+        reply, error = session.ask(prompt), None
+    except Exception as e:
+        reply, error = None, str(e)
+    finally:
+        session.scheduler.clear_all()  # Timers/alarms the prompt set must not fire later
+    elapsed = time.perf_counter() - start
+    source = "error" if error else session.reply_source
+    context_ms = {name: None if t is None else round(t * 1000, 1) for name, t in session.last_context_timings.items()}
+    return {"id": item_id, "prompt": prompt, "reply": reply, "backend": source,
+            "latency_ms": round(elapsed * 1000, 1), "ok": source != "error", "context_ms": context_ms,
+            **({"error": error} if error else {})}
+
+
+def pct(values, q):
+    return np.percentile(values, q) * 1000 if values else float("nan")
+
+
+items = load_items(args.input)
+if not items:
+    print("❌ No prompts found")
+    sys.exit(1)
+
+arthur.VOICE_MODE = False
+arthur.MEMORY_ENABLED = False  # Batch prompts stay out of the real long-term memory
+with open(os.devnull, "w") as devnull, redirect_stdout(sys.stdout if args.verbose else devnull):
+    assistant = arthur.VoiceAssistant()
+
+print(f"📦 Batch: {len(items)} prompts, {args.workers} workers, {assistant.ai_mode}"
+      f"{' (mock)' if args.mock else ''} -> {args.output}\n")
+print("=" * 60)
+
+latencies, sources = [], Counter()
+started = time.perf_counter()
+with open(args.output, "w", encoding="utf-8") as out, open(os.devnull, "w") as devnull, \
+        redirect_stdout(sys.stdout if args.verbose else devnull), ThreadPoolExecutor(args.workers) as pool:
+    futures = [pool.submit(run_item, item_id, prompt) for item_id, prompt in items]
+    for done, future in enumerate(as_completed(futures), 1):
+        result = future.result()
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+        latencies.append(result["latency_ms"] / 1000)
+        sources[result["backend"]] += 1
+        if not args.verbose and (done % 50 == 0 or done == len(items)):
+            print(f"\r   {done}/{len(items)} done", end="", file=sys.stderr, flush=True)
+elapsed = time.perf_counter() - started
+
+if not args.verbose:
+    print(file=sys.stderr)
+failed = sources["error"]
+print(f"\n📊 {len(items)} prompts in {elapsed:.1f}s: {len(items) - failed} ok, {failed} failed")
+print(f"   Throughput: {len(items) / elapsed:.1f} prompts/s")
+print(f"   Latency:    p50 {pct(latencies, 50):.0f}ms  p95 {pct(latencies, 95):.0f}ms  p99 {pct(latencies, 99):.0f}ms  "
+      f"max {max(latencies) * 1000:.0f}ms")
+print(f"   Answered by: {', '.join(f'{name} {count}' for name, count in sources.most_common())}")
+print("\n" + "=" * 60)
+
+if args.mock:
+    mock.shutdown()
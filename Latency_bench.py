@@ -0,0 +1,195 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from Mock_llm import start_mock_server
+
+# End-to-end latency benchmark: WAV fixture -> record (VAD) -> transcribe -> command routing -> LLM -> TTS.
+# The LLM is a local mock (Mock_llm.py) and weather is stubbed, so it runs on any Linux box without a
+# mic, API keys or `ollama serve`.
+#
+# Usage: python Latency_bench.py fixtures/ [--backend ollama] [--runs 5] [--stream-stt] [--tts [--barge-in]]
+# Fixtures are 16-bit mono 16 kHz WAVs. With --skip-stt, a sidecar <name>.txt holds the transcript.
+
+parser = argparse.ArgumentParser(description="Arthur end-to-end latency benchmark")
+parser.add_argument("fixtures", nargs="+", help="WAV files or folders of WAVs")
+parser.add_argument("--backend", choices=["openai", "ollama"], default="openai")
+parser.add_argument("--runs", type=int, default=5)
+parser.add_argument("--first-token-ms", type=float, default=300.0)
+parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+parser.add_argument("--whisper-model", default="tiny")
+parser.add_argument("--stt-backend", choices=["openai-whisper", "faster-whisper"], default="openai-whisper")
+parser.add_argument("--skip-stt", action="store_true", help="use <fixture>.txt instead of running Whisper")
+parser.add_argument("--stream-stt", action="store_true",
+                    help="feed fixtures at real time and transcribe while they play (StreamingTranscriber)")
+parser.add_argument("--tts", action="store_true", help="measure time to first audio from pyttsx3")
+parser.add_argument("--barge-in", action="store_true",
+                    help="with --tts: play through PyAudio and interrupt each reply, measuring interrupt-to-silence")
+args = parser.parse_args()
+
+# Point both backends at the mock before Test_Room_Ai (and the ollama client) are imported
+mock, mock_url = start_mock_server(args.first_token_ms, args.tokens_per_sec)
+os.environ["OPENAI_BASE_URL"] = f"{mock_url}/v1"
+os.environ["OLLAMA_HOST"] = mock_url
+os.environ.pop("OPENWEATHER_API_KEY", None)
+if args.backend == "openai":
+    os.environ["OPENAI_API_KEY"] = "mock"
+else:
+    os.environ.pop("OPENAI_API_KEY", None)
+
+import Test_Room_Ai as arthur
+
+files = []
+for arg in args.fixtures:
+    p = Path(arg)
+    files += sorted(p.glob("*.wav")) if p.is_dir() else [p]
+if not files:
+    print("❌ No WAV fixtures found")
+    sys.exit(1)
+
+arthur.VOICE_MODE = False
+arthur.MEMORY_ENABLED = False  # Bench prompts stay out of the real long-term memory, same prompt size every run
+assistant = arthur.VoiceAssistant()
+
+# Stub weather: canned responses straight into the cache, no network
+arthur.WEATHER_API_KEY = "stub"
+now = time.time()
+assistant.weather_cache.values["weather"] = ({
+    "main": {"temp": 4.0, "feels_like": 1.0, "humidity": 80}, "weather": [{"description": "light rain"}]
+}, now)
+assistant.weather_cache.values["forecast"] = ({"list": []}, now)
+
+if not args.skip_stt:
+    print(f"🔄 Loading Whisper ({args.stt_backend} {args.whisper_model})...")
+    assistant.stt = arthur.load_stt(args.stt_backend, args.whisper_model)
+
+tts_started = threading.Event()
+if args.tts:
+    assistant.tts = arthur.SpeechWorker(assistant.interrupt, on_start=tts_started.set,
+                                        pa=arthur.pyaudio.PyAudio() if args.barge_in else None)
+
+STAGES = ["endpoint", "record", "transcribe", "route", "llm_first_token", "llm_first_sentence", "llm_total", "tts", "e2e",
+          "barge_in"]
+results = {stage: [] for stage in STAGES}
+
+
+def timed(fn, *a):
+    start = time.perf_counter()
+    out = fn(*a)
+    return out, time.perf_counter() - start
+
+
+def realtime(chunks):
+    """Pace fixture chunks like a live mic, so partial transcription has time to run"""
+    for pcm in chunks:
+        time.sleep(len(pcm) / arthur.SAMPLE_RATE)
+        yield pcm
+
+
+def run_turn(path):
+    assistant.history.clear()  # Same prompt size every run
+    arthur.metrics.new_turn()
+
+    live = None
+    if args.stream_stt and not args.skip_stt:
+        live = assistant.live_stt = arthur.StreamingTranscriber(assistant._decode, assistant.rec_buffer)
+        audio, t_record = timed(assistant.capture_utterance, realtime(arthur.wav_chunks(path, assistant.audio.chunk)))
+        assistant.live_stt = None
+    else:
+        audio, t_record = timed(assistant.record_wav, path)
+    endpoint = assistant.vad.endpoint_latency or 0.0
+
+    if args.skip_stt:
+        text, t_stt = path.with_suffix(".txt").read_text().strip(), 0.0
+    elif live:
+        if audio is None:
+            live.cancel()
+            text, t_stt = None, 0.0
+        else:
+            text, t_stt = timed(live.finish, len(audio))
+            text = assistant._clean_transcript(text)
+    else:
+        text, t_stt = timed(assistant.transcribe, audio)
+    if not text:
+        print(f"⚠️ {path.name}: nothing transcribed, skipped")
+        return
+
+    quick, t_route = timed(assistant._quick_response, text)
+
+    start = time.perf_counter()
+    first_token = first_sentence = None
+    if quick:
+        first_token = first_sentence = 0.0
+        sentence = quick
+    else:
+        tokens = assistant.stream_openai(text) if assistant.use_openai else assistant.stream_ollama(text)
+
+        def watched():
+            nonlocal first_token
+            for token in tokens:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                yield token
+
+        sentence = None
+        for s in assistant._sentences(watched()):
+            if sentence is None:
+                sentence, first_sentence = s, time.perf_counter() - start
+    t_llm = time.perf_counter() - start
+
+    t_tts = t_barge_in = 0.0
+    if args.tts and sentence:
+        tts_started.clear()
+        start = time.perf_counter()
+        done = assistant.tts.say(sentence)
+        tts_started.wait(10)
+        t_tts = time.perf_counter() - start
+        if args.barge_in:
+            time.sleep(0.1)  # Interrupt mid-sentence, like "Hey Arthur" would
+            assistant.tts.last_barge_in = None
+            assistant.interrupt.set()
+            done.wait(10)
+            t_barge_in = assistant.tts.last_barge_in or 0.0  # None: the sentence ended before the interrupt
+            assistant.interrupt.clear()
+        else:
+            assistant.tts.cancel()
+            done.wait(10)
+
+    turn = {
+        "endpoint": endpoint, "record": t_record, "transcribe": t_stt, "route": t_route,
+        "llm_first_token": first_token or 0.0, "llm_first_sentence": first_sentence or 0.0, "llm_total": t_llm,
+        "tts": t_tts, "barge_in": t_barge_in,
+    }
+    turn["e2e"] = endpoint + t_stt + t_route + turn["llm_first_sentence"] + t_tts
+    for stage, value in turn.items():
+        results[stage].append(value)
+
+
+print(f"\n⏱️ Running {len(files)} fixture(s) x {args.runs} run(s) against mock {args.backend} "
+      f"({args.first_token_ms:.0f} ms to first token, {args.tokens_per_sec:.0f} tok/s)\n")
+for run in range(args.runs):
+    for path in files:
+        run_turn(path)
+
+print("\n" + "=" * 50)
+print(f"\n{'stage':<20} {'p50':>10} {'p95':>10}\n")
+for stage in STAGES:
+    values = results[stage]
+    if not values or (stage == "tts" and not args.tts) or (stage == "transcribe" and args.skip_stt) or \
+            (stage == "barge_in" and not args.barge_in):
+        continue
+    p50, p95 = np.percentile(values, [50, 95]) * 1000
+    print(f"{stage:<20} {p50:>8.1f}ms {p95:>8.1f}ms")
+print(f"\n📊 e2e = end of speech -> first audio (endpoint + transcribe + route + first sentence + TTS start)")
+if args.barge_in:
+    print(f"   barge_in = interrupt -> silence, including the output stream's latency")
+print(f"   {len(results['e2e'])} turns measured")
+print("\n" + "=" * 50)
+
+arthur.metrics.export()  # Writes the Prometheus/trace files when ARTHUR_METRICS=1
+mock.shutdown()
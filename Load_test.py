@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import requests
+
+# Load generator for server mode: N clients, one session each, asking back to back for a fixed time.
+# Reports requests per second, tail latency and how many asks admission control turned away.
+#
+# Usage: python Load_test.py [--clients 16] [--duration 20] [--stream]
+# By default it starts Mock_llm.py and an Arthur server (ARTHUR_SERVER=1) pointed at it, so it runs
+# without API keys or `ollama serve`. Pass --url to load an Arthur server that is already running.
+
+parser = argparse.ArgumentParser(description="Arthur server mode load test")
+parser.add_argument("--url", help="existing server, e.g. http://127.0.0.1:8765 (default: start mock + server)")
+parser.add_argument("--clients", type=int, default=16)
+parser.add_argument("--duration", type=float, default=20.0)
+parser.add_argument("--stream", action="store_true", help="use streamed replies and report time to first token")
+parser.add_argument("--backend", choices=["openai", "ollama"], default="openai")
+parser.add_argument("--port", type=int, default=8765)
+parser.add_argument("--first-token-ms", type=float, default=300.0)
+parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+args = parser.parse_args()
+
+PROMPTS = [
+    "tell me a joke",
+    "what should I play tonight",
+    "give me a fun fact about sharks",
+    "set a timer for 10 minutes",
+    "what timers are running",
+    "is it cold outside",
+    "recommend a show like Dark",
+    "how do I get better at swimming",
+]
+
+procs = []
+
+
+def start_local_stack():
+    """Mock LLM + Arthur server as subprocesses, returns the server URL"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    mock_port = args.port + 1
+    procs.append(subprocess.Popen(
+        [sys.executable, os.path.join(here, "Mock_llm.py"), "--port", str(mock_port),
+         "--first-token-ms", str(args.first_token_ms), "--tokens-per-sec", str(args.tokens_per_sec)],
+        stdout=subprocess.DEVNULL))
+
+    env = dict(os.environ, ARTHUR_SERVER="1", ARTHUR_PORT=str(args.port),
+               OPENAI_BASE_URL=f"http://127.0.0.1:{mock_port}/v1", OLLAMA_HOST=f"http://127.0.0.1:{mock_port}")
+    env.pop("OPENWEATHER_API_KEY", None)
+    if args.backend == "openai":
+        env["OPENAI_API_KEY"] = "mock"
+    else:
+        env.pop("OPENAI_API_KEY", None)
+    procs.append(subprocess.Popen([sys.executable, os.path.join(here, "Test_Room_Ai.py")], env=env,
+                                  stdout=subprocess.DEVNULL, cwd=here))
+
+    url = f"http://127.0.0.1:{args.port}"
+    for _ in range(300):
+        try:
+            requests.get(f"{url}/health", timeout=1)
+            return url
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise SystemExit("❌ Server didn't come up")
+
+
+def ask(http, url, session, prompt):
+    """One ask, returns (status, seconds, seconds to first token or None)"""
+    start = time.perf_counter()
+    body = {"prompt": prompt, "stream": args.stream}
+    if not args.stream:
+        response = http.post(f"{url}/sessions/{session}/ask", json=body, timeout=60)
+        return response.status_code, time.perf_counter() - start, None
+
+    first = None
+    with http.post(f"{url}/sessions/{session}/ask", json=body, stream=True, timeout=60) as response:
+        if response.status_code != 200:
+            return response.status_code, time.perf_counter() - start, None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("data: "):
+                event = json.loads(line[len("data: "):])
+                if first is None and "token" in event:
+                    first = time.perf_counter() - start
+                if event.get("done"):
+                    break
+    return 200, time.perf_counter() - start, first
+
+
+def client(url, deadline, results):
+    http = requests.Session()
+    session = http.post(f"{url}/sessions", timeout=10).json()["session"]
+    while time.perf_counter() < deadline:
+        try:
+            status, seconds, first = ask(http, url, session, random.choice(PROMPTS))
+        except requests.RequestException:
+            status, seconds, first = 0, 0.0, None
+        results.append((status, seconds, first))
+        if status == 503:
+            time.sleep(0.05)  # Back off a little, like a polite client honouring Retry-After would
+
+
+def pct(values, q):
+    return np.percentile(values, q) * 1000 if values else float("nan")
+
+
+try:
+    url = args.url or start_local_stack()
+    print(f"🔥 Load test: {args.clients} clients x {args.duration:.0f}s against {url}"
+          f"{' (streaming)' if args.stream else ''}\n")
+    print("=" * 60)
+
+    results = []
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=client, args=(url, deadline, results)) for _ in range(args.clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    ok = [seconds for status, seconds, _ in results if status == 200]
+    firsts = [first for status, _, first in results if status == 200 and first is not None]
+    rejected = sum(1 for status, _, _ in results if status == 503)
+    errors = len(results) - len(ok) - rejected
+
+    print(f"\n📊 {len(results)} asks: {len(ok)} ok, {rejected} rejected (503), {errors} failed")
+    print(f"   Throughput: {len(ok) / elapsed:.1f} req/s")
+    print(f"   Latency:    p50 {pct(ok, 50):.0f}ms  p95 {pct(ok, 95):.0f}ms  p99 {pct(ok, 99):.0f}ms  "
+          f"max {max(ok, default=0) * 1000:.0f}ms")
+    if firsts:
+        print(f"   First token: p50 {pct(firsts, 50):.0f}ms  p95 {pct(firsts, 95):.0f}ms  p99 {pct(firsts, 99):.0f}ms")
+    print(f"   Server: {requests.get(f'{url}/health', timeout=5).json()}")
+    print("\n" + "=" * 60)
+finally:
+    for proc in procs:
+        proc.terminate()
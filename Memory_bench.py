@@ -0,0 +1,64 @@
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from Test_Room_Ai import ConversationMemory, MEMORY_TOKEN_BUDGET
+
+# Usage: python Memory_bench.py [number_of_turns]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+QUERIES = 200
+
+TOPICS = ["grounded 2", "roblox", "subnautica", "taekwondo", "swimming", "skiing", "math homework", "french test",
+          "stranger things", "the dark series", "sophie the dog", "shadow the puppy", "kenzy", "boots the cat",
+          "my gpu", "the stream controller", "alex", "matheo", "isaac", "freya", "pizza", "the weekend", "snow"]
+VERBS = ["what do you think about", "tell me something about", "remind me about", "I was talking about",
+         "any ideas for", "how do I get better at", "what's new with", "give me a fact about"]
+
+print("🧠 Conversation Memory Benchmark\n")
+print("=" * 50)
+
+random.seed(0)
+path = Path(tempfile.mkdtemp()) / "memory_bench.db"
+
+# Append: N turns through the write-behind queue
+memory = ConversationMemory(str(path))
+start = time.perf_counter()
+for i in range(N):
+    topic = random.choice(TOPICS)
+    memory.add(f"{random.choice(VERBS)} {topic} #{i}", f"Honestly, {topic} is a whole thing. Turn {i}.")
+elapsed = time.perf_counter() - start
+print(f"\n📥 Append: {N} turns in {elapsed * 1000:.0f} ms ({N / elapsed:,.0f}/s)")
+
+start = time.perf_counter()
+memory.flush()
+print(f"💾 Flush: write-behind caught up {(time.perf_counter() - start) * 1000:.0f} ms later")
+memory.close()
+
+# Reload from disk, the way a restart does
+start = time.perf_counter()
+memory = ConversationMemory(str(path))
+print(f"🔄 Load: {len(memory.turns)} turns in {(time.perf_counter() - start) * 1000:.0f} ms "
+      f"({path.stat().st_size / 1e6:.1f} MB on disk)")
+
+# Retrieval: search + pack for fresh prompts
+search_ms, pack_ms, packed = [], [], []
+for _ in range(QUERIES):
+    prompt = f"{random.choice(VERBS)} {random.choice(TOPICS)}"
+    start = time.perf_counter()
+    memory.search(prompt)
+    search_ms.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    packed.append(len(memory.pack(prompt)))
+    pack_ms.append((time.perf_counter() - start) * 1000)
+
+for name, values in (("Search", search_ms), ("Pack", pack_ms)):
+    values.sort()
+    print(f"🔎 {name} ({N} turns): median {statistics.median(values):.2f} ms, "
+          f"p95 {values[int(len(values) * 0.95)]:.2f} ms, worst {values[-1]:.2f} ms")
+print(f"📦 Packed {statistics.mean(packed):.1f} turns per prompt ({MEMORY_TOKEN_BUDGET} token budget)")
+
+memory.close()
+print("\n" + "=" * 50)
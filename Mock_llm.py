@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-ins for the OpenAI chat-completions API and the Ollama API, for benchmarks and load tests.
+#   OpenAI: GET /v1/models, POST /v1/chat/completions (JSON or SSE with "stream": true)
+#   Ollama: GET /api/tags, POST /api/chat (JSON or NDJSON with "stream": true, the default)
+# Every reply waits first_token_ms, then emits tokens at tokens_per_sec.
+# Prompts go through a simulated prefix cache: the part shared with the previous request to the same
+# model counts as cached, the rest costs prompt_ms_per_token. Usage is reported the way each API does
+# (OpenAI usage.prompt_tokens_details.cached_tokens, Ollama prompt_eval_count/prompt_eval_duration).
+
+_prompt_cache = {}  # model -> previous prompt text
+
+DEFAULT_REPLY = ("Ha, nice try. I'm basically a genius in a box, so let's hear it. "
+                 "Honestly, whatever it is, I've got a sarcastic answer ready.")
+
+
+def tokenize(text):
+    """Split text into word-ish tokens that keep their leading space, like real LLM tokens"""
+    words = text.split(" ")
+    return [words[0]] + [" " + w for w in words[1:]]
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    first_token_ms = 200.0
+    tokens_per_sec = 40.0
+    prompt_ms_per_token = 0.0
+    reply = DEFAULT_REPLY
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _evaluate_prompt(self, request):
+        """Returns (prompt_tokens, cached_tokens), sleeping for the uncached part"""
+        text = "".join(f"{m.get('role')}: {m.get('content')}\n" for m in request.get("messages", []))
+        model = request.get("model", "")
+        common = len(os.path.commonprefix([text, _prompt_cache.get(model, "")]))
+        _prompt_cache[model] = text
+        total, cached = len(text) // 4, common // 4  # ~4 characters per token
+        time.sleep((total - cached) * self.prompt_ms_per_token / 1000)
+        return total, cached
+
+    def _tokens(self):
+        time.sleep(self.first_token_ms / 1000)
+        for i, token in enumerate(tokenize(self.reply)):
+            if i:
+                time.sleep(1 / self.tokens_per_sec)
+            yield token
+
+    def _stream(self, content_type, lines):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for line in lines:
+                data = line.encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):  # Client closed the stream early (barge-in)
+            self.close_connection = True
+
+    def do_GET(self):
+        if self.path == "/v1/models":
+            self._send_json({"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]})
+        elif self.path == "/api/tags":
+            self._send_json({"models": [{"name": "llama3.2:3b", "model": "llama3.2:3b"}]})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path == "/v1/chat/completions":
+            prompt_tokens, cached = self._evaluate_prompt(request)
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokenize(self.reply)),
+                     "prompt_tokens_details": {"cached_tokens": cached}}
+            if request.get("stream"):
+                lines = (f"data: {json.dumps({'choices': [{'index': 0, 'delta': {'content': t}}]})}\n\n"
+                         for t in self._tokens())
+                if (request.get("stream_options") or {}).get("include_usage"):
+                    lines = _then(lines, f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n")
+                self._stream("text/event-stream", _then(lines, "data: [DONE]\n\n"))
+            else:
+                text = "".join(self._tokens())
+                self._send_json({
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": usage
+                })
+        elif self.path == "/api/chat":
+            model = request.get("model", "llama3.2:3b")
+            prompt_tokens, cached = self._evaluate_prompt(request)
+            stats = {"prompt_eval_count": prompt_tokens - cached,
+                     "prompt_eval_duration": int((prompt_tokens - cached) * self.prompt_ms_per_token * 1e6)}
+            if request.get("stream", True):
+                lines = (json.dumps({"model": model, "message": {"role": "assistant", "content": t}, "done": False}) + "\n"
+                         for t in self._tokens())
+                final = json.dumps({"model": model, "message": {"role": "assistant", "content": ""},
+                                    "done": True, "done_reason": "stop", **stats}) + "\n"
+                self._stream("application/x-ndjson", _then(lines, final))
+            else:
+                text = "".join(self._tokens())
+                self._send_json({"model": model, "message": {"role": "assistant", "content": text},
+                                 "done": True, "done_reason": "stop", **stats})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+
+def _then(lines, last):
+    yield from lines
+    yield last
+
+
+def start_mock_server(first_token_ms=200.0, tokens_per_sec=40.0, reply=DEFAULT_REPLY, port=0, prompt_ms_per_token=0.0):
+    """Start the mock on a background thread, returns (server, "http://127.0.0.1:port")"""
+    handler = type("ConfiguredMockLLMHandler", (MockLLMHandler,), {
+        "first_token_ms": first_token_ms, "tokens_per_sec": tokens_per_sec, "reply": reply,
+        "prompt_ms_per_token": prompt_ms_per_token
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve mock OpenAI + Ollama APIs")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--first-token-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--prompt-ms-per-token", type=float, default=0.0, help="cost of each uncached prompt token")
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    args = parser.parse_args()
+
+    server, url = start_mock_server(args.first_token_ms, args.tokens_per_sec, args.reply, args.port,
+                                    args.prompt_ms_per_token)
+    print(f"🧪 Mock LLM on {url}")
+    print(f"   OpenAI: OPENAI_BASE_URL={url}/v1")
+    print(f"   Ollama: OLLAMA_HOST={url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
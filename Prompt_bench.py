@@ -0,0 +1,124 @@
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from Mock_llm import start_mock_server
+
+# Prompt caching benchmark: the old prompt layout (timestamp and weather inside the system prompt) vs the
+# current one (static persona first, time/weather after the history), over a conversation where a minute
+# passes between turns. Reports how much of each prompt the backend had to evaluate.
+#
+# Usage: python Prompt_bench.py [--backend ollama] [--turns 8] [--mock]
+# Without --mock it talks to the real backend (OPENAI_API_KEY or `ollama serve`). OpenAI only caches
+# prompts of 1024+ tokens, so with Arthur's shorter prompt expect cached_tokens to stay 0 there.
+
+parser = argparse.ArgumentParser(description="Arthur prompt prefix caching benchmark")
+parser.add_argument("--backend", choices=["openai", "ollama"], default="ollama")
+parser.add_argument("--turns", type=int, default=8)
+parser.add_argument("--mock", action="store_true", help="use Mock_llm.py's simulated prefix cache")
+parser.add_argument("--mock-ms-per-token", type=float, default=0.5, help="mock cost of an uncached prompt token")
+args = parser.parse_args()
+
+if args.mock:
+    mock, mock_url = start_mock_server(first_token_ms=0, tokens_per_sec=1000, prompt_ms_per_token=args.mock_ms_per_token)
+    os.environ["OPENAI_BASE_URL"] = f"{mock_url}/v1"
+    os.environ["OLLAMA_HOST"] = mock_url
+    if args.backend == "openai":
+        os.environ["OPENAI_API_KEY"] = "mock"
+if args.backend == "ollama":
+    os.environ.pop("OPENAI_API_KEY", None)
+
+import Test_Room_Ai as arthur
+
+
+class Clock(datetime):
+    """datetime.now() that moves forward a minute per turn, like a real conversation"""
+    offset = timedelta()
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz) + cls.offset
+
+
+arthur.datetime = Clock
+arthur.VOICE_MODE = False
+arthur.MEMORY_ENABLED = False  # Bench prompts stay out of the real long-term memory, same prompt size every run
+assistant = arthur.VoiceAssistant()
+
+# Stub weather so the weather turn injects the same kind of text it would in real use
+arthur.WEATHER_API_KEY = "stub"
+assistant.weather_cache.values["weather"] = ({
+    "main": {"temp": 4.0, "feels_like": 1.0, "humidity": 80}, "weather": [{"description": "light rain"}]
+}, time.time())
+
+PROMPTS = [
+    "hey, what's up",
+    "tell me a joke",
+    "is it cold outside",
+    "recommend a game like Grounded 2",
+    "who wins in a fight, a shark or a bear",
+    "what should I name my next pet",
+    "give me a fun fact about space",
+    "what's a good swimming warm-up",
+]
+
+
+# ── Before: persona with the timestamp near the top, weather appended to the system prompt ──────────
+def legacy_messages(prompt):
+    current_time = Clock.now().strftime("%A, %B %d, %Y at %I:%M %p")
+    persona = arthur.USER_INFO.replace("\n\n", f"\n\nCurrent Date/Time: {current_time}\n\n", 1)
+    msgs = [{
+        "role": "system",
+        "content": f"You are Arthur, Ronan's AI. Be casual, witty, concise (1-2 sentences).\n\n{persona}"
+                   f"{assistant._weather_context(prompt)}"
+    }]
+    for entry in list(assistant.history)[-3:]:
+        msgs.append({"role": "user", "content": entry["user"]})
+        msgs.append({"role": "assistant", "content": entry["assistant"]})
+    msgs.append({"role": "user", "content": prompt})
+    return msgs
+
+
+def run(layout, build):
+    assistant._build_messages = build
+    assistant.history.clear()
+    turns = []
+    for i in range(args.turns):
+        Clock.offset += timedelta(minutes=1)
+        start = time.perf_counter()
+        "".join(assistant.stream_reply(PROMPTS[i % len(PROMPTS)]))
+        turns.append((time.perf_counter() - start, dict(assistant.last_prompt_stats)))
+
+    print(f"\n{layout}")
+    for i, (elapsed, stats) in enumerate(turns, 1):
+        detail = "  ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items())
+        print(f"   turn {i:<3} {elapsed * 1000:>8.1f}ms   {detail or 'no usage reported'}")
+    return turns[1:]  # Turn 1 is a cold start for both layouts
+
+
+def summary(turns, key):
+    values = [stats[key] for _, stats in turns if key in stats]
+    return statistics.median(values) if values else None
+
+
+print(f"🧠 Prompt Caching Benchmark ({arthur.OLLAMA_MODEL if args.backend == 'ollama' else arthur.OPENAI_MODEL}"
+      f"{', mock' if args.mock else ''})\n")
+print("=" * 78)
+
+before = run("Before: timestamp + weather in the system prompt", legacy_messages)
+after = run("After: static persona first, time/weather last", type(assistant)._build_messages.__get__(assistant))
+
+print("\n" + "=" * 78)
+print(f"\n📊 Median over turns 2-{args.turns}:")
+keys = ["prompt_eval_tokens", "prompt_eval_seconds"] if args.backend == "ollama" else ["prompt_tokens", "cached_tokens"]
+for key in keys:
+    b, a = summary(before, key), summary(after, key)
+    if b is not None and a is not None:
+        print(f"   {key:<20} {b:>10.4g} -> {a:.4g}")
+print(f"   {'turn latency':<20} {statistics.median(t for t, _ in before) * 1000:>8.1f}ms -> "
+      f"{statistics.median(t for t, _ in after) * 1000:.1f}ms")
+
+if args.mock:
+    mock.shutdown()
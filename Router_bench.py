@@ -0,0 +1,140 @@
+import re
+import statistics
+import sys
+import time
+
+from Test_Room_Ai import route, word_to_number, ALARM_LABEL_RE, TIMER_LABEL_RE
+
+# Usage: python Router_bench.py [repeats]
+REPEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+# Real command phrasings (plus everyday prompts that fall through to the AI)
+CORPUS = [
+    "set an alarm for 7:30 AM",
+    "set alarm for seven thirty am for school",
+    "Create an alarm at 6 AM for swimming",
+    "wake me up, set alarm for twelve pm",
+    "what alarms do I have",
+    "show my alarms",
+    "list alarms",
+    "cancel my alarm at 7:30 AM",
+    "delete all alarms",
+    "remove the alarm",
+    "set a timer for 5 minutes",
+    "set timer for twenty-five minutes for pizza",
+    "start a timer for an hour and thirty minutes",
+    "timer for ten seconds",
+    "create a timer for 2 hours 30 minutes for laundry",
+    "what timers are running",
+    "check my timers",
+    "show timers",
+    "cancel the first timer",
+    "stop timer number 2",
+    "cancel the last timer",
+    "clear all timers",
+    "clear history",
+    "forget everything",
+    "reset memory",
+    "what's the weather like",
+    "is it cold outside",
+    "what's the forecast for the weekend",
+    "tell me a joke",
+    "what time is it",
+    "what's my brother's iq",
+    "who wins in a fight, a shark or a bear",
+    "recommend a game like Grounded 2",
+    "how many days until Christmas",
+]
+
+# ── Before: the original handle_command checks and word_to_number ──────────────────────────────────
+LEGACY_NUMBERS = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+                  'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen',
+                  'eighteen', 'nineteen', 'twenty', 'twenty-one', 'twenty-two', 'twenty-three', 'twenty-four',
+                  'twenty-five', 'twenty-six', 'twenty-seven', 'twenty-eight', 'twenty-nine', 'thirty',
+                  'forty', 'fifty', 'sixty', 'a', 'an']
+LEGACY_DIGITS = dict(zip(LEGACY_NUMBERS, ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13',
+                                          '14', '15', '16', '17', '18', '19', '20', '21', '22', '23', '24', '25',
+                                          '26', '27', '28', '29', '30', '40', '50', '60', '1', '1']))
+
+
+def legacy_word_to_number(text):
+    for word, num in LEGACY_DIGITS.items():
+        text = re.sub(r'\b' + word + r'\b', num, text)
+    return text
+
+
+def legacy_route(text):
+    lower = text.lower()
+    if any(p in lower for p in ['reset history', 'clear history', 'forget everything', 'clear memory', 'reset memory']):
+        return "clear_history"
+    if 'alarm' in lower and ('set' in lower or 'create' in lower or 'for' in lower or 'at' in lower):
+        return "set_alarm"
+    if 'alarm' in lower and ('list' in lower or 'show' in lower or 'what' in lower):
+        return "list_alarms"
+    if 'alarm' in lower and ('clear' in lower or 'delete' in lower or 'remove' in lower or 'cancel' in lower):
+        return "clear_alarms"
+    if 'timer' in lower and ('set' in lower or 'create' in lower or 'for' in lower or 'start' in lower):
+        return "set_timer"
+    if 'timer' in lower and ('list' in lower or 'show' in lower or 'what' in lower or 'check' in lower):
+        return "list_timers"
+    if 'timer' in lower and ('clear' in lower or 'delete' in lower or 'remove' in lower or 'cancel' in lower or 'stop' in lower):
+        return "clear_timers"
+    return None
+
+
+def legacy_parse(text):
+    name = legacy_route(text)
+    legacy_word_to_number(text)
+    if name == "set_alarm":
+        label = text.lower()
+        for word in ['am', 'pm', 'o\'clock', 'oclock'] + LEGACY_NUMBERS:
+            label = re.sub(r'\b' + word + r'\b', '', label, flags=re.IGNORECASE)
+    elif name == "set_timer":
+        label = text.lower()
+        for word in ['minutes', 'minute', 'min', 'hours', 'hour', 'hr', 'seconds', 'second', 'sec', 'timer'] + LEGACY_NUMBERS:
+            label = re.sub(r'\b' + word + r'\b', '', label, flags=re.IGNORECASE)
+    return name
+
+
+# ── After: compiled router ─────────────────────────────────────────────────────────────────────────
+def compiled_parse(text):
+    intent = route(text)
+    word_to_number(text)
+    if intent and intent.name == "set_alarm":
+        ALARM_LABEL_RE.sub('', intent.lower)
+    elif intent and intent.name == "set_timer":
+        TIMER_LABEL_RE.sub('', intent.lower)
+    return intent.name if intent else None
+
+
+def per_command_us(parse, text):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        parse(text)
+    return (time.perf_counter() - start) / REPEATS * 1e6
+
+
+print("🧭 Command Router Benchmark\n")
+print("=" * 78)
+
+mismatches = [t for t in CORPUS if legacy_parse(t) != compiled_parse(t)]
+if mismatches:
+    print("\n❌ Routing differs from the original for:")
+    for text in mismatches:
+        print(f"   {text!r}: {legacy_parse(text)} -> {compiled_parse(text)}")
+else:
+    print(f"\n✅ Same intent as the original for all {len(CORPUS)} phrasings")
+
+print(f"\n{'command':<52} {'intent':<14} {'before':>8} {'after':>8}\n")
+before, after = [], []
+for text in CORPUS:
+    b = per_command_us(legacy_parse, text)
+    a = per_command_us(compiled_parse, text)
+    before.append(b)
+    after.append(a)
+    print(f"{text[:50]:<52} {str(compiled_parse(text)):<14} {b:>6.1f}µs {a:>6.1f}µs")
+
+print("\n" + "=" * 78)
+print(f"\n📊 Median per command: {statistics.median(before):.1f}µs -> {statistics.median(after):.1f}µs "
+      f"({statistics.median(before) / statistics.median(after):.1f}x faster)")
+print(f"   Worst per command:  {max(before):.1f}µs -> {max(after):.1f}µs")
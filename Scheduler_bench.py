@@ -0,0 +1,61 @@
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from Test_Room_Ai import Scheduler
+
+# Usage: python Scheduler_bench.py [number_of_entries]
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+print("⏰ Alarm/Timer Scheduler Benchmark\n")
+print("=" * 50)
+
+# Insert: N entries spread over the next day
+sched = Scheduler()
+now = datetime.now()
+due_times = [now + timedelta(seconds=random.uniform(3600, 86400)) for _ in range(N)]
+
+start = time.perf_counter()
+ids = [sched.add(due, "timer", f"t{i}") for i, due in enumerate(due_times)]
+elapsed = time.perf_counter() - start
+print(f"\n📥 Insert: {N} entries in {elapsed * 1000:.1f} ms ({N / elapsed:,.0f}/s)")
+
+# Cancel: half of them, in random order
+to_cancel = random.sample(ids, N // 2)
+start = time.perf_counter()
+for entry_id in to_cancel:
+    sched.cancel(entry_id)
+elapsed = time.perf_counter() - start
+print(f"🗑️ Cancel: {len(to_cancel)} entries in {elapsed * 1000:.1f} ms ({len(to_cancel) / elapsed:,.0f}/s)")
+
+# Fire: N entries that are all already due
+sched = Scheduler()
+past = datetime.now() - timedelta(seconds=1)
+start = time.perf_counter()
+for i in range(N):
+    sched.add(past, "timer", f"f{i}")
+for _ in range(N):
+    sched.fired.get()
+elapsed = time.perf_counter() - start
+print(f"🔔 Fire: {N} entries in {elapsed * 1000:.1f} ms ({N / elapsed:,.0f}/s)")
+
+# Accuracy: short timers firing while N others are pending
+sched = Scheduler()
+for _ in range(N):
+    sched.add(datetime.now() + timedelta(hours=1), "timer")
+
+SHORT = 20
+for i in range(SHORT):
+    sched.add(datetime.now() + timedelta(seconds=0.1 + i * 0.05), "alarm")
+
+lateness = []
+for _ in range(SHORT):
+    _, due, _ = sched.fired.get()
+    lateness.append((datetime.now() - due).total_seconds() * 1000)
+
+print(f"🎯 Accuracy ({SHORT} fires, {N} pending): "
+      f"median {statistics.median(lateness):.1f} ms late, worst {max(lateness):.1f} ms")
+
+print("\n" + "=" * 50)
@@ -0,0 +1,103 @@
+import argparse
+import re
+import statistics
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from Test_Room_Ai import SAMPLE_RATE, STT_BACKENDS, load_stt
+
+# Speech-to-text benchmark: load time and real-time factor (decode time / audio length, lower is better)
+# for every backend x model size on a set of WAV fixtures. Fixtures with a sidecar <name>.txt transcript
+# also get a word error rate, so the most accurate model that still fits the latency budget can be picked.
+#
+# Usage: python Stt_bench.py fixtures/ [--backends openai-whisper faster-whisper] [--models tiny base small]
+#                            [--threads 4] [--runs 3] [--max-rtf 0.3]
+# Fixtures are 16-bit mono 16 kHz WAVs (DEBUG_SAVE_WAV in Test_Room_Ai.py writes exactly that).
+
+parser = argparse.ArgumentParser(description="Arthur speech-to-text benchmark")
+parser.add_argument("fixtures", nargs="+", help="WAV files or folders of WAVs")
+parser.add_argument("--backends", nargs="+", choices=list(STT_BACKENDS), default=list(STT_BACKENDS))
+parser.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+parser.add_argument("--threads", type=int, default=0, help="CPU threads, 0 = library default")
+parser.add_argument("--runs", type=int, default=3)
+parser.add_argument("--max-rtf", type=float, default=0.3, help="latency budget as a p95 real-time factor")
+args = parser.parse_args()
+
+files = []
+for arg in args.fixtures:
+    p = Path(arg)
+    files += sorted(p.glob("*.wav")) if p.is_dir() else [p]
+if not files:
+    print("❌ No WAV fixtures found")
+    sys.exit(1)
+
+
+def read_wav(path):
+    with wave.open(str(path), "rb") as wf:
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def words(text):
+    return re.sub(r"[^\w' ]", " ", text.lower()).split()
+
+
+def wer(reference, hypothesis):
+    """Word error rate: word-level edit distance / reference length"""
+    ref, hyp = words(reference), words(hypothesis)
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / max(len(ref), 1)
+
+
+fixtures = [(path, read_wav(path), path.with_suffix(".txt")) for path in files]
+audio_secs = sum(len(audio) for _, audio, _ in fixtures) / SAMPLE_RATE
+print(f"🎙️ STT Benchmark: {len(fixtures)} fixture(s), {audio_secs:.1f}s of audio, {args.runs} run(s)"
+      f"{f', {args.threads} threads' if args.threads else ''}\n")
+print("=" * 78)
+print(f"\n{'backend':<16} {'model':<10} {'load':>8} {'RTF p50':>9} {'RTF p95':>9} {'WER':>7}\n")
+
+results = []
+for backend in args.backends:
+    for model in args.models:
+        try:
+            start = time.perf_counter()
+            stt = load_stt(backend, model, args.threads)
+            load = time.perf_counter() - start
+        except Exception as e:
+            print(f"{backend:<16} {model:<10} ⚠️ {e}")
+            continue
+
+        rtfs, errors = [], []
+        for _ in range(args.runs):
+            for path, audio, reference in fixtures:
+                start = time.perf_counter()
+                text = stt.decode(audio)["text"]
+                rtfs.append((time.perf_counter() - start) / (len(audio) / SAMPLE_RATE))
+                if reference.exists():
+                    errors.append(wer(reference.read_text(), text))
+
+        p50, p95 = np.percentile(rtfs, [50, 95])
+        error = statistics.mean(errors) if errors else None
+        results.append((backend, model, p95, error))
+        print(f"{backend:<16} {model:<10} {load:>7.1f}s {p50:>9.3f} {p95:>9.3f} "
+              f"{f'{error:.1%}' if error is not None else '-':>7}")
+        del stt
+
+print("\n" + "=" * 78)
+fits = [r for r in results if r[2] <= args.max_rtf]
+if fits:
+    # Most accurate within budget, without transcripts the largest model (models are listed smallest first)
+    backend, model, p95, error = min(fits, key=lambda r: (r[3] if r[3] is not None else 0, -args.models.index(r[1]), r[2]))
+    print(f"\n📊 Best within RTF {args.max_rtf}: {backend} {model} (p95 RTF {p95:.3f}"
+          f"{f', WER {error:.1%}' if error is not None else ''})")
+    print(f"   Run Arthur with ARTHUR_STT={backend} ARTHUR_STT_MODEL={model}"
+          f"{f' ARTHUR_STT_THREADS={args.threads}' if args.threads else ''}")
+else:
+    print(f"\n⚠️ Nothing fits RTF {args.max_rtf}, try a smaller model or more --threads")
@@ -1,9 +1,14 @@
-import pvporcupine, pyaudio, struct, whisper, wave, os, tempfile, threading, time, numpy as np
-import ollama, pyttsx3, queue, requests, re
+import pvporcupine, pyaudio, wave, os, threading, time, numpy as np
+import ollama, pyttsx3, queue, requests, re, json, heapq, itertools, bisect, hashlib, sqlite3, zlib, asyncio, copy, tempfile, contextvars
 from pathlib import Path
-from typing import Optional
-from collections import deque
+from typing import Optional, NamedTuple
+from collections import deque, defaultdict, OrderedDict
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ════════════════════════════════════════════════════════════════════════════════════════════════════
 # ⚙️ CONFIG
@@ -14,23 +19,88 @@ ACCESS_KEY = os.getenv("PORCUPINE_ACCESS_KEY")
 WAKE_WORD_PATH = "Hey-Arthur_en_windows_v3_0_0.ppn"
 MIC_INDEX, SAMPLE_RATE, CHUNK = 1, 16000, 512
 SILENCE_THRESH, SILENCE_TIME, MIN_SPEECH = 500, 1.5, 0.3
+AUDIO_PROFILE_FILE = "arthur_audio_profile.json"  # Written by Audio_test.py, overrides MIC_INDEX/SILENCE_THRESH/CHUNK
+MAX_RECORD = 30  # Seconds
+VAD_SPEECH_MARGIN, VAD_CONFIDENT_MARGIN = 9.0, 18.0  # dB above the noise floor for speech / for a confident turn
+VAD_FAST_HANGOVER = 0.5  # Seconds of silence that end a confident turn (SILENCE_TIME otherwise)
+VAD_MIN_DB, VAD_MAX_ZCR = 30.0, 0.45  # Ignore near-digital-silence and hiss-like chunks
+PRE_ROLL, RING_SECONDS = 0.1, 10  # Seconds of audio before the wake word end to keep / total audio kept
+STT_BACKEND = os.getenv("ARTHUR_STT", "openai-whisper")  # Or "faster-whisper" (int8 CTranslate2), see Stt_bench.py
+STT_MODEL = os.getenv("ARTHUR_STT_MODEL", "tiny")  # Whisper model size
+STT_THREADS = int(os.getenv("ARTHUR_STT_THREADS", "0"))  # CPU threads for inference, 0 = library default
+STT_COMPUTE_TYPE = "int8"  # faster-whisper weight precision
+STREAMING_STT = True  # Transcribe while the user is still talking
+STT_STEP, STT_EDGE = 1.0, 0.5  # Seconds of new audio between partial passes / words this close to the edge stay open
+DEBUG_SAVE_WAV, DEBUG_WAV_DIR = False, "debug_audio"  # Dump each recording to disk for debugging
 OLLAMA_MODEL, MAX_TOKENS, TEMP = "llama3.2:3b", 150, 0.7
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model, and with it the cached prompt prefix, loaded between turns
+OLLAMA_NUM_CTX = 2048  # Persona (~600 tokens) + MEMORY_TOKEN_BUDGET + context + MAX_TOKENS. Changing it reloads the model
 VOICE_RATE = 180
+STREAM_REPLIES = True  # Speak/print replies sentence-by-sentence while the LLM is still generating
+
+# Metrics - per-stage latency histograms and counters, off by default
+METRICS_ENABLED = os.getenv("ARTHUR_METRICS") == "1"
+METRICS_PROM_FILE, METRICS_TRACE_FILE = "arthur_metrics.prom", "arthur_trace.jsonl"
+METRICS_EXPORT_INTERVAL = 15  # Seconds
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Response cache - reuse replies to repeated prompts, off by default
+RESPONSE_CACHE = os.getenv("ARTHUR_RESPONSE_CACHE") == "1"
+RESPONSE_CACHE_FILE, RESPONSE_CACHE_SIZE = "arthur_responses.json", 256
+RESPONSE_CACHE_TTL, RESPONSE_TIME_TTL = 86400, 60  # Seconds a reply is reused / if the prompt is about the time or date
+
+# Speech cache - short phrases rendered to WAV once and played back from disk
+TTS_CACHE, TTS_CACHE_DIR, TTS_CACHE_MB = True, "tts_cache", 50
+TTS_CACHE_MAX_CHARS = 120  # Longer text (most LLM replies) always goes through the TTS engine
+TTS_PLAY_CHUNK = 512  # Frames per write to the output stream (~23 ms), the interrupt is checked between writes
+
+# Conversation memory - every turn saved to SQLite, relevant older turns pulled back into the prompt
+MEMORY_ENABLED, MEMORY_DB = True, "arthur_memory.db"
+MEMORY_EMBED_DIM, MEMORY_RECENT, MEMORY_TOP_K = 256, 3, 4  # Vector size / latest turns always sent / older turns searched for
+MEMORY_MIN_SCORE = 0.2  # Cosine similarity an older turn needs to be pulled in
+MEMORY_TOKEN_BUDGET = 600  # Prompt tokens for past turns
+MEMORY_FLUSH_INTERVAL, MEMORY_FLUSH_BATCH = 2.0, 64  # Write-behind: seconds / turns per transaction
+
+# Context - gathered concurrently before each LLM call, a provider that misses its deadline is left out
+CONTEXT_DEADLINES = {"time": 0.1, "weather": 1.2, "forecast": 1.2, "alarms": 0.1, "memory": 0.25}  # Seconds, weather: WEATHER_FIRST_WAIT + margin
+CONTEXT_WORKERS = 8
+
+# LLM backend routing - circuit breaker per backend, optional hedging
+BACKEND_WINDOW, BACKEND_SLOW_MS = 20, 5000  # Outcomes kept per backend / median first token that counts as slow
+BREAKER_FAILURES, BREAKER_ERROR_RATE = 3, 0.5  # Open the circuit after this many failures in a row or this error rate
+BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN = 15, 300  # Seconds before probing an open backend, doubling up to the max
+BACKEND_HEDGE_MS = None  # e.g. 1500: no first token from the preferred backend by then, race the other one too
+
+# Server mode - local HTTP API with one session per client (ARTHUR_SERVER=1)
+SERVER_MODE = os.getenv("ARTHUR_SERVER") == "1"
+SERVER_HOST, SERVER_PORT = "127.0.0.1", int(os.getenv("ARTHUR_PORT", "8765"))
+SERVER_WORKERS, SERVER_QUEUE_LIMIT, SERVER_QUEUE_TIMEOUT = 8, 32, 10.0  # Concurrent asks / waiting asks / seconds to wait
+SERVER_SESSION_IDLE = 3600  # Seconds before an idle session (and its timers) is dropped
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = "gpt-4o-mini"
 
+# HTTP - (connect, read) timeouts in seconds per endpoint
+HTTP_TIMEOUTS = {"openai": (3.05, 30), "openai_check": (3.05, 5), "weather": (3.05, 5), "warm": 5}
+HTTP_RETRIES, HTTP_BACKOFF, HTTP_POOL_SIZE = 3, 0.3, 8
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")  # Point at a local mock for benchmarks
+OPENAI_URL = f"{OPENAI_BASE_URL}/chat/completions"
+OPENAI_MODELS_URL = f"{OPENAI_BASE_URL}/models"
+
 # Weather API (OpenWeatherMap - free tier)
 WEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
 WEATHER_LOCATION = "Noels Pond,CA"
+WEATHER_TTL, FORECAST_TTL = 600, 3600  # Seconds a cached response counts as fresh
+WEATHER_REFRESH_AT, WEATHER_RETRY = 0.8, 60  # Refresh at 80% of the TTL, retry failed fetches after 60 s
+WEATHER_FIRST_WAIT = 1.0  # Seconds a weather question right after startup waits for the first fetch
+FORECAST_WORDS = ('weekend', 'forecast', 'saturday', 'sunday', 'this week', 'next week')  # Prompt words that pull in the forecast
+WEATHER_WORDS = ('weather', 'temperature', 'outside', 'hot', 'cold', 'rain', 'snow')  # ...or the current weather
 
 USER_INFO = """Name: Ronan
 Age: 13
 Location: Noels Pond, Newfoundland, Canada
 
-Current Date/Time: {current_time}
-
 Personality:
 Smart-ass, adventurous, sarcastic, and funny. Dark sense of humor, usually jokes around and doesn't take things too seriously. Likes when Arthur talks like a friend — casual, witty, and not robotic.
 
@@ -65,755 +135,2533 @@ CUSTOM_RESPONSES = {
     "brothers iq": "Your brother's IQ is lower than a rock. Just kidding!"
 }
 
+# Spoken often enough to render at startup, anything else is cached the second time it's said
+TTS_PRERENDER = [
+    "I didn't catch that.", "Recording issue. Try again.", "Still warming up, give me a sec.",
+    "⏰ ALARM!", "⏱️ TIMER DONE!", "No timers running", "No alarms set",
+    *(f"Timer set for {m} minute{'s' if m != 1 else ''}" for m in (1, 2, 3, 5, 10, 15, 20, 30)),
+]
+
+# Byte-identical on every request so Ollama's KV cache and OpenAI's prompt caching can reuse it.
+# Anything that changes per turn (time, weather) goes in a context message after the history.
+SYSTEM_PROMPT = f"You are Arthur, Ronan's AI. Be casual, witty, concise (1-2 sentences).\n\n{USER_INFO}"
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
 # ════════════════════════════════════════════════════════════════════════════════════════════════════
-# 🤖 ASSISTANT
+# 📈 METRICS
 # ════════════════════════════════════════════════════════════════════════════════════════════════════
-class VoiceAssistant:
-    def __init__(self):
-        self.history = deque(maxlen=100)
-        self.wake_queue = queue.Queue()
-        self.interrupt = threading.Event()
-        self.speaking = False
-        self.audio_lock = threading.Lock()
-        self.voice_mode = VOICE_MODE
-        
-        # AI Mode Selection
-        self.use_openai = False
-        self.ai_mode = "Checking..."
-        
-        # Alarms & Timers
-        self.alarms = []
-        self.timers = []
-        self.alarm_lock = threading.Lock()
-        
-        # Check AI availability
-        self._setup_ai()
+class _Span:
+    __slots__ = ("metrics", "stage", "turn", "start")
+    
+    def __init__(self, metrics, stage: str, turn: int):
+        self.metrics, self.stage, self.turn = metrics, stage, turn
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start, self.turn)
+
+class Metrics:
+    """Per-stage latency histograms, counters and a span trace, exported as Prometheus text and JSONL.
+    
+    Disabled (the default) every call returns straight away and span() hands back one shared
+    no-op context manager, so leaving the instrumentation in costs next to nothing."""
+    
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.turn = 0  # Last turn id handed out
+        self.current = contextvars.ContextVar("metrics_turn", default=None)  # Turn of the running task/thread
+        self.counters = defaultdict(int)
+        self.histograms = {}  # stage -> [bucket counts..., +Inf count], sum
+        self.sums = defaultdict(float)
+        self.trace = []  # Spans not yet written to METRICS_TRACE_FILE
+        self.no_span = nullcontext()
+    
+    def new_turn(self) -> int:
+        """Start a new turn in the current task/thread, spans recorded there from now on carry its id.
         
-        if self.voice_mode:
-            # Porcupine
-            self.porcupine = pvporcupine.create(
-                access_key=ACCESS_KEY,
-                keyword_paths=[WAKE_WORD_PATH]
-            )
-            
-            # Whisper
-            print("🔄 Loading Whisper...")
-            self.whisper = whisper.load_model("tiny")
+        Concurrent turns (server requests, batch items) each keep their own id. Threads that never
+        started a turn, like the speech worker, get the most recent one."""
+        if not self.enabled:
+            return 0
+        with self.lock:
+            self.turn += 1
+            self.counters["turns"] += 1
+            turn = self.turn
+        self.current.set(turn)
+        return turn
+    
+    def current_turn(self) -> int:
+        turn = self.current.get()
+        return self.turn if turn is None else turn
+    
+    def span(self, stage: str):
+        """Context manager that times one stage of the current turn"""
+        if not self.enabled:
+            return self.no_span
+        return _Span(self, stage, self.current_turn())
+    
+    def inc(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] += n
+    
+    def observe(self, stage: str, seconds: float, turn: Optional[int] = None):
+        """Record a stage duration (histogram + trace)"""
+        if not self.enabled:
+            return
+        turn = self.current_turn() if turn is None else turn
+        with self.lock:
+            buckets = self.histograms.setdefault(stage, [0] * (len(METRICS_BUCKETS) + 1))
+            buckets[bisect.bisect_left(METRICS_BUCKETS, seconds)] += 1
+            self.sums[stage] += seconds
+            self.trace.append({"turn": turn, "stage": stage,
+                               "end": round(time.time(), 3), "ms": round(seconds * 1000, 2)})
+    
+    def prometheus(self) -> str:
+        """Current counters and histograms in Prometheus text format"""
+        lines = []
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                lines += [f"# TYPE arthur_{name}_total counter", f"arthur_{name}_total {value}"]
             
-            # Audio
-            self.pa = pyaudio.PyAudio()
-            self.stream = self.pa.open(
-                rate=self.porcupine.sample_rate,
-                channels=1,
-                format=pyaudio.paInt16,
-                input=True,
-                frames_per_buffer=self.porcupine.frame_length,
-                input_device_index=MIC_INDEX
-            )
+            lines.append("# TYPE arthur_stage_seconds histogram")
+            for stage, buckets in sorted(self.histograms.items()):
+                total = 0
+                for le, count in zip([*METRICS_BUCKETS, "+Inf"], buckets):
+                    total += count
+                    lines.append(f'arthur_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {total}')
+                lines.append(f'arthur_stage_seconds_sum{{stage="{stage}"}} {self.sums[stage]:.6f}')
+                lines.append(f'arthur_stage_seconds_count{{stage="{stage}"}} {total}')
+        return "\n".join(lines) + "\n"
+    
+    def export(self):
+        """Rewrite the Prometheus file and append pending spans to the trace file"""
+        if not self.enabled:
+            return
+        try:
+            tmp = Path(METRICS_PROM_FILE + ".tmp")
+            tmp.write_text(self.prometheus(), encoding="utf-8")
+            tmp.replace(METRICS_PROM_FILE)
             
-            print(f"✅ Arthur ready (Voice Mode) - Using {self.ai_mode}!")
-        else:
-            self.porcupine = None
-            self.whisper = None
-            self.pa = None
-            self.stream = None
-            print(f"✅ Arthur ready (Text Mode) - Using {self.ai_mode}!")
+            with self.lock:
+                spans, self.trace = self.trace, []
+            if spans:
+                with open(METRICS_TRACE_FILE, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(span) + "\n" for span in spans)
+        except Exception as e:
+            print(f"⚠️ Metrics export error: {e}")
+    
+    def start_exporter(self):
+        """Export every METRICS_EXPORT_INTERVAL seconds in the background"""
+        def run():
+            while True:
+                time.sleep(METRICS_EXPORT_INTERVAL)
+                self.export()
         
-        # Start alarm/timer monitor
-        threading.Thread(target=self.monitor_alarms_timers, daemon=True).start()
+        if self.enabled:
+            threading.Thread(target=run, daemon=True).start()
+
+metrics = Metrics()
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🎧 AUDIO CAPTURE
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class AudioProfile(NamedTuple):
+    """Mic settings: from the Audio_test.py calibration if there is one, else the CONFIG constants"""
+    mic_index: Optional[int] = MIC_INDEX
+    mic_name: str = ""
+    silence_thresh: float = SILENCE_THRESH  # RMS of int16 samples
+    chunk: int = CHUNK
+
+def load_audio_profile(path: str = AUDIO_PROFILE_FILE) -> AudioProfile:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        profile = AudioProfile(data["mic_index"], data.get("mic_name", ""),
+                               float(data["silence_thresh"]), int(data["chunk"]))
+        print(f"🎚️ Audio profile: mic [{profile.mic_index}] {profile.mic_name}, "
+              f"threshold {profile.silence_thresh:.0f}, chunk {profile.chunk}")
+        return profile
+    except FileNotFoundError:
+        return AudioProfile()
+    except Exception as e:
+        print(f"⚠️ Ignoring audio profile {path}: {e}")
+        return AudioProfile()
+
+class AudioRing:
+    """Single-writer ring buffer of int16 samples. Readers keep their own absolute cursor,
+    so the wake word detector and the recorder can read the same audio independently."""
     
-    def _setup_ai(self):
-        """Check internet and AI availability, prioritize OpenAI if available"""
-        if OPENAI_API_KEY:
-            if self._check_openai():
-                self.use_openai = True
-                self.ai_mode = "OpenAI GPT-4o-mini (Online)"
-                print("✅ OpenAI: Connected")
-                return
-            else:
-                print("⚠️ OpenAI: Not available (no internet or invalid API key)")
-        else:
-            print("⚠️ OpenAI: API key not set")
+    def __init__(self, seconds: float, rate: int = SAMPLE_RATE):
+        self.size = int(seconds * rate)
+        self.buf = np.zeros(self.size, dtype=np.int16)
+        self.written = 0  # Total samples ever written (only the capture thread advances it)
+        self.writing_to = 0  # Where the write in progress ends, published before its copy starts
+        self.new_data = threading.Condition()
+    
+    def write(self, pcm: np.ndarray):
+        """Append samples (capture thread only)"""
+        n = len(pcm)
+        start = self.written % self.size
+        split = min(n, self.size - start)
+        self.writing_to = self.written + n  # Samples before writing_to - size may be overwritten from here on
+        self.buf[start:start + split] = pcm[:split]
+        self.buf[:n - split] = pcm[split:]
         
-        if self._check_ollama():
-            self.use_openai = False
-            self.ai_mode = "Ollama (Offline)"
-            print(f"✅ Ollama: {OLLAMA_MODEL}")
-        else:
-            print("❌ Error: Neither OpenAI nor Ollama available!")
-            print("   - For OpenAI: Set OPENAI_API_KEY environment variable and connect to internet")
-            print("   - For Ollama: Start with 'ollama serve'")
-            exit(1)
+        # Publish only after the samples are in place, readers never take a lock to copy data
+        self.written = self.writing_to
+        with self.new_data:
+            self.new_data.notify_all()
     
-    def _check_openai(self) -> bool:
-        """Check if OpenAI API is accessible"""
-        try:
-            test_response = requests.get("https://www.google.com", timeout=3)
-            if test_response.status_code != 200:
-                return False
-            
-            headers = {
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": OPENAI_MODEL,
-                "messages": [{"role": "user", "content": "test"}],
-                "max_tokens": 5
-            }
-            
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=10
-            )
+    def read(self, cursor: int, n: int, timeout: Optional[float] = None):
+        """Wait for samples [cursor, cursor + n) and return (samples, next_cursor), or (None, cursor) on timeout"""
+        if self.written < cursor + n:
+            with self.new_data:
+                if not self.new_data.wait_for(lambda: self.written >= cursor + n, timeout):
+                    return None, cursor
+        
+        while True:
+            # A reader that fell further behind than the buffer holds skips to the oldest valid audio
+            cursor = max(cursor, self.writing_to - self.size)
+            start = cursor % self.size
+            split = min(n, self.size - start)
+            out = np.concatenate((self.buf[start:start + split], self.buf[:n - split]))
             
-            return response.status_code in [200, 401]
-        except:
-            return False
+            if cursor >= self.writing_to - self.size:  # No write started over these samples while copying
+                return out, cursor + n
+
+class EnergyVAD:
+    """Streaming voice activity detector / endpointer for int16 chunks.
     
-    def _check_ollama(self) -> bool:
-        """Check if Ollama is running"""
-        try:
-            ollama.list()
-            return True
-        except:
-            return False
+    Tracks an adaptive noise floor (dB) and calls a chunk speech when its energy is clearly
+    above that floor and its zero-crossing rate doesn't look like hiss. The turn ends after
+    VAD_FAST_HANGOVER of silence when the speech was well above the floor, otherwise after
+    SILENCE_TIME. Anything with reset() and update(pcm) -> bool can be swapped in as self.vad."""
     
-    def monitor_wake_word(self):
-        """Background wake word detection"""
-        while True:
-            try:
-                with self.audio_lock:
-                    if self.stream.is_active():
-                        pcm = self.stream.read(self.porcupine.frame_length, exception_on_overflow=False)
-                    else:
-                        time.sleep(0.1)
-                        continue
-                
-                if self.porcupine.process(struct.unpack_from("h" * self.porcupine.frame_length, pcm)) >= 0:
-                    if self.speaking:
-                        self.interrupt.set()
-                        print("\n⚠️ INTERRUPT!")
-                    else:
-                        self.wake_queue.put(time.time())
-                        print("\n🟢 Wake word!")
-            except Exception as e:
-                print(f"⚠️ {e}")
-                time.sleep(0.1)
+    def __init__(self, rate: int = SAMPLE_RATE, chunk: int = CHUNK, silence_thresh: float = SILENCE_THRESH):
+        self.chunk_secs = chunk / rate
+        self.noise_db = 20 * np.log10(silence_thresh) - VAD_SPEECH_MARGIN
+        self.endpoint_latency = None
+        self.reset()
     
-    def monitor_alarms_timers(self):
-        """Background alarm/timer checker"""
-        while True:
-            try:
-                now = datetime.now()
-                
-                with self.alarm_lock:
-                    triggered_alarms = []
-                    for alarm_time, label in self.alarms:
-                        if now >= alarm_time:
-                            triggered_alarms.append((alarm_time, label))
-                    
-                    for alarm in triggered_alarms:
-                        self.alarms.remove(alarm)
-                        msg = f"⏰ ALARM! {alarm[1]}" if alarm[1] else "⏰ ALARM!"
-                        print(f"\n{msg}")
-                        self.play_alarm_sound()
-                        self.speak(msg)
-                    
-                    triggered_timers = []
-                    for end_time, label in self.timers:
-                        if now >= end_time:
-                            triggered_timers.append((end_time, label))
-                    
-                    for timer in triggered_timers:
-                        self.timers.remove(timer)
-                        msg = f"⏱️ TIMER DONE! {timer[1]}" if timer[1] else "⏱️ TIMER DONE!"
-                        print(f"\n{msg}")
-                        self.play_alarm_sound()
-                        self.speak(msg)
-                
-                time.sleep(1)
-            except Exception as e:
-                print(f"⚠️ Alarm monitor error: {e}")
-                time.sleep(1)
+    def reset(self):
+        """Start a new utterance (the noise floor carries over between turns)"""
+        self.in_speech = False
+        self.speech_chunks = 0
+        self.silence_chunks = 0
+        self.confidence = 0.0  # Running mean of how far speech sits above the floor, in dB
     
-    def word_to_number(self, text: str) -> str:
-        """Convert word numbers to digits"""
-        word_to_num = {
-            'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
-            'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
-            'eleven': '11', 'twelve': '12', 'thirteen': '13', 'fourteen': '14', 'fifteen': '15',
-            'sixteen': '16', 'seventeen': '17', 'eighteen': '18', 'nineteen': '19', 'twenty': '20',
-            'twenty-one': '21', 'twenty-two': '22', 'twenty-three': '23', 'twenty-four': '24',
-            'twenty-five': '25', 'twenty-six': '26', 'twenty-seven': '27', 'twenty-eight': '28',
-            'twenty-nine': '29', 'thirty': '30', 'forty': '40', 'fifty': '50', 'sixty': '60',
-            'a': '1', 'an': '1'
-        }
+    def features(self, pcm: np.ndarray):
+        """Energy in dB and zero-crossing rate of one chunk"""
+        x = pcm.astype(np.float32)
+        db = 10 * np.log10(np.dot(x, x) / len(x) + 1.0)
+        zcr = np.count_nonzero(np.diff(np.signbit(x))) / len(x)
+        return float(db), float(zcr)
+    
+    def update(self, pcm: np.ndarray) -> bool:
+        """Feed one chunk, returns True once the utterance has ended"""
+        db, zcr = self.features(pcm)
+        margin = db - self.noise_db
+        speech = margin > VAD_SPEECH_MARGIN and db > VAD_MIN_DB and zcr < VAD_MAX_ZCR
+        
+        if speech:
+            self.speech_chunks += 1
+            self.silence_chunks = 0
+            self.confidence += (margin - self.confidence) / self.speech_chunks
+            self.noise_db += 0.005 * (db - self.noise_db)  # Creep up so a steady new noise isn't speech forever
+            if not self.in_speech and self.speech_chunks >= 2:
+                self.in_speech = True
+                print("   🗣️ Speaking...")
+        else:
+            self.silence_chunks += 1
+            self.noise_db += (0.2 if db < self.noise_db else 0.05) * (db - self.noise_db)
         
-        for word, num in word_to_num.items():
-            text = re.sub(r'\b' + word + r'\b', num, text)
+        hangover = VAD_FAST_HANGOVER if self.confidence >= VAD_CONFIDENT_MARGIN else SILENCE_TIME
+        silence = self.silence_chunks * self.chunk_secs
+        if self.in_speech and self.speech_chunks * self.chunk_secs >= MIN_SPEECH and silence >= hangover:
+            self.endpoint_latency = silence
+            return True
+        return False
+
+def wav_chunks(path: str, chunk: int = CHUNK):
+    """Yield int16 chunks from a 16-bit mono WAV at SAMPLE_RATE (test fixtures instead of the mic)"""
+    with wave.open(str(path), "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: need 16-bit mono {SAMPLE_RATE} Hz")
+        while True:
+            data = wf.readframes(chunk)
+            if len(data) < chunk * 2:
+                break
+            yield np.frombuffer(data, dtype=np.int16)
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 📝 SPEECH TO TEXT
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class WhisperBackend:
+    """openai-whisper on PyTorch, fp32 on the CPU"""
+    name = "openai-whisper"
+    
+    def __init__(self, model: str = STT_MODEL, threads: int = STT_THREADS):
+        import torch, whisper
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = whisper.load_model(model, device="cpu")
+    
+    def decode(self, audio: np.ndarray, prompt: str = "", word_timestamps: bool = False) -> dict:
+        return self.model.transcribe(audio, language="en", fp16=False, temperature=0.0,
+                                     initial_prompt=prompt or None, word_timestamps=word_timestamps,
+                                     condition_on_previous_text=False)
+
+class FasterWhisperBackend:
+    """faster-whisper (CTranslate2) with int8 weights, usually several times faster on a CPU.
+    Needs `pip install faster-whisper`, the model is downloaded on first use."""
+    name = "faster-whisper"
+    
+    def __init__(self, model: str = STT_MODEL, threads: int = STT_THREADS):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(model, device="cpu", compute_type=STT_COMPUTE_TYPE, cpu_threads=threads)
+    
+    def decode(self, audio: np.ndarray, prompt: str = "", word_timestamps: bool = False) -> dict:
+        """Same result shape as openai-whisper: {"text", "segments": [{"words": [{"word", "start", "end"}]}]}"""
+        segments, _ = self.model.transcribe(audio, language="en", beam_size=1, temperature=0.0,
+                                            initial_prompt=prompt or None, word_timestamps=word_timestamps,
+                                            condition_on_previous_text=False)
+        segments = [{"text": seg.text,
+                     "words": [{"word": w.word, "start": w.start, "end": w.end} for w in seg.words or []]}
+                    for seg in segments]  # Decoding happens lazily, while iterating
+        return {"text": "".join(seg["text"] for seg in segments), "segments": segments}
+
+STT_BACKENDS = {backend.name: backend for backend in (WhisperBackend, FasterWhisperBackend)}
+
+def load_stt(backend: str = STT_BACKEND, model: str = STT_MODEL, threads: int = STT_THREADS):
+    """Load a speech-to-text backend and run one warm-up pass, so the first real turn doesn't pay for it"""
+    stt = STT_BACKENDS[backend](model, threads)
+    warm_up = np.random.default_rng(0).normal(0, 0.01, SAMPLE_RATE).astype(np.float32)  # 1 s of faint noise
+    stt.decode(warm_up)
+    return stt
+
+class StreamingTranscriber:
+    """Transcribes an utterance on a worker thread while it is still being recorded.
+    
+    Every STT_STEP seconds of new audio, the not-yet-committed part of the buffer is decoded
+    again. Words that two passes in a row agree on (and that aren't right at the growing edge)
+    get committed: their text is kept and the window start moves past them. So later passes,
+    and the final decode in finish(), only see the tail, with the committed text as prompt."""
+    
+    def __init__(self, decode, buffer: np.ndarray, rate: int = SAMPLE_RATE):
+        self.decode = decode  # (audio, prompt, word_timestamps) -> Whisper-style result dict
+        self.buffer, self.rate = buffer, rate
+        self.available = 0  # Samples of the utterance recorded so far
+        self.committed_at = 0  # Buffer position the committed words end at
+        self.committed = []
+        self.pending = []  # Uncommitted words from the last pass: (word, start, end) in samples
+        self.done = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def feed(self, n: int):
+        """Recorder progress: the first n samples of the buffer are filled"""
+        with self.cond:
+            self.available = n
+            self.cond.notify()
+    
+    def finish(self, n: int) -> str:
+        """End of speech: decode only the uncommitted tail and return the full text"""
+        with self.cond:
+            self.available, self.done = n, True
+            self.cond.notify()
+        self.thread.join()
         
+        text = " ".join(self.committed)
+        tail = self.buffer[self.committed_at:n]
+        if len(tail) >= self.rate // 10:
+            result = self.decode(tail.copy(), text, False)
+            text = f"{text} {result['text'].strip()}".strip()
         return text
     
-    def parse_time(self, text: str) -> Optional[datetime]:
-        """Parse time expressions"""
-        text = self.word_to_number(text.strip()).upper()
+    def cancel(self):
+        with self.cond:
+            self.done = True
+            self.cond.notify()
+    
+    @staticmethod
+    def _norm(word: str) -> str:
+        return re.sub(r"[^\w']", "", word.lower())
+    
+    def _run(self):
+        step = int(STT_STEP * self.rate)
+        decoded_to = 0
         
-        match = re.search(r'(\d{1,2}):(\d{2})\s*(AM|PM)', text)
-        if match:
-            hour, minute, period = match.groups()
-            hour = int(hour)
-            minute = int(minute)
-            
-            if period == 'PM' and hour != 12:
-                hour += 12
-            elif period == 'AM' and hour == 12:
-                hour = 0
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.done or self.available - decoded_to >= step)
+                if self.done:
+                    return
+                end = decoded_to = self.available
             
-            target = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
-            if target <= datetime.now():
-                target += timedelta(days=1)
-            return target
-        
-        match = re.search(r'(\d{1,2})\s*(AM|PM)', text)
-        if match:
-            hour, period = match.groups()
-            hour = int(hour)
+            start = self.committed_at
+            try:
+                with metrics.span("stt_partial"):
+                    result = self.decode(self.buffer[start:end].copy(), " ".join(self.committed), True)
+            except Exception as e:
+                print(f"⚠️ Partial transcribe error: {e}")
+                return
             
-            if period == 'PM' and hour != 12:
-                hour += 12
-            elif period == 'AM' and hour == 12:
-                hour = 0
+            words = [(w["word"].strip(), start + int(w["start"] * self.rate), start + int(w["end"] * self.rate))
+                     for seg in result.get("segments", []) for w in seg.get("words", [])]
             
-            target = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
-            if target <= datetime.now():
-                target += timedelta(days=1)
-            return target
-        
-        match = re.search(r'(\d{1,2}):(\d{2})', text)
-        if match:
-            hour, minute = match.groups()
-            hour = int(hour)
-            minute = int(minute)
+            # Local agreement: commit the prefix this pass shares with the previous one,
+            # minus anything ending near the edge, where the next chunk may still change it
+            agreed = 0
+            for (word, _, _), (prev, _, _) in zip(words, self.pending):
+                if self._norm(word) != self._norm(prev):
+                    break
+                agreed += 1
+            edge = end - int(STT_EDGE * self.rate)
+            while agreed and words[agreed - 1][2] > edge:
+                agreed -= 1
             
-            target = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
-            if target <= datetime.now():
-                target += timedelta(days=1)
-            return target
-        
-        return None
+            if agreed:
+                self.committed += [word for word, _, _ in words[:agreed]]
+                self.committed_at = words[agreed - 1][2]
+            self.pending = words[agreed:]
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🔊 SPEECH
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class TtsClip(NamedTuple):
+    """Rendered speech: raw PCM frames and their format"""
+    frames: bytes
+    width: int
+    channels: int
+    rate: int
+
+def read_clip(path) -> TtsClip:
+    with wave.open(str(path), "rb") as wf:
+        if not wf.getnframes():
+            raise ValueError("empty render")
+        return TtsClip(wf.readframes(wf.getnframes()), wf.getsampwidth(), wf.getnchannels(), wf.getframerate())
+
+class TtsCache:
+    """Rendered phrases on disk, one WAV per (text, voice, rate), least recently used evicted past TTS_CACHE_MB.
     
-    def parse_duration(self, text: str) -> Optional[int]:
-        """Parse duration in seconds"""
-        text = self.word_to_number(text.lower())
-        total_seconds = 0
+    File mtimes record use, so the LRU order survives restarts."""
+    
+    def __init__(self, folder: str = TTS_CACHE_DIR, max_mb: float = TTS_CACHE_MB):
+        self.dir = Path(folder)
+        self.dir.mkdir(exist_ok=True)
+        self.max_bytes = int(max_mb * 1e6)
+        self.lock = threading.Lock()
+        self.files = OrderedDict()  # key -> size in bytes, least recently used first
+        self.hits = self.misses = 0
         
-        match = re.search(r'(\d+)\s*(?:hour|hr)s?', text)
-        if match:
-            total_seconds += int(match.group(1)) * 3600
+        for path in self.dir.glob("*.part.wav"):  # Renders a crash interrupted
+            path.unlink(missing_ok=True)
+        for path in sorted(self.dir.glob("*.wav"), key=lambda p: p.stat().st_mtime):
+            self.files[path.stem] = path.stat().st_size
+    
+    @staticmethod
+    def key(text: str, voice: str, rate: int) -> str:
+        return hashlib.sha1(f"{voice}\0{rate}\0{text}".encode()).hexdigest()[:20]
+    
+    def part_path(self, key: str) -> Path:
+        """Where to render a phrase before put() moves it into the cache"""
+        return self.dir / f"{key}.part.wav"
+    
+    def get(self, key: str) -> Optional[TtsClip]:
+        with self.lock:
+            if key not in self.files:
+                self.misses += 1
+                return None
+            self.files.move_to_end(key)
         
-        match = re.search(r'(\d+)\s*(?:minute|min)s?', text)
-        if match:
-            total_seconds += int(match.group(1)) * 60
+        path = self.dir / f"{key}.wav"
+        try:
+            clip = read_clip(path)
+            os.utime(path)
+        except Exception as e:
+            print(f"⚠️ Speech cache entry unreadable, dropping it: {e}")
+            self._drop(key)
+            return None
         
-        match = re.search(r'(\d+)\s*(?:second|sec)s?', text)
-        if match:
-            total_seconds += int(match.group(1))
+        with self.lock:
+            self.hits += 1
+        return clip
+    
+    def put(self, key: str, rendered: Path) -> bool:
+        """Move a freshly rendered WAV into the cache, False if the TTS driver didn't produce one"""
+        try:
+            read_clip(rendered)
+            path = self.dir / f"{key}.wav"
+            os.replace(rendered, path)
+        except Exception as e:
+            print(f"⚠️ Speech cache render failed: {e}")
+            rendered.unlink(missing_ok=True)
+            return False
         
-        return total_seconds if total_seconds > 0 else None
+        with self.lock:
+            self.files[key] = path.stat().st_size
+            self.files.move_to_end(key)
+            evict = []
+            while len(self.files) > 1 and sum(self.files.values()) > self.max_bytes:
+                evict.append(self.files.popitem(last=False)[0])
+        for old in evict:
+            (self.dir / f"{old}.wav").unlink(missing_ok=True)
+        return True
     
-    def play_alarm_sound(self):
-        """Play alarm sound"""
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            return key in self.files
+    
+    def summary(self) -> str:
+        with self.lock:
+            hits, misses, count, size = self.hits, self.misses, len(self.files), sum(self.files.values())
+        rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+        return f"{hits} hits, {misses} misses ({rate:.0f}% hit rate), {count} phrases ({size / 1e6:.1f} MB)"
+    
+    def _drop(self, key: str):
+        with self.lock:
+            self.files.pop(key, None)
+        (self.dir / f"{key}.wav").unlink(missing_ok=True)
+
+class TimedEvent(threading.Event):
+    """Event that remembers when it was last set, for interrupt-to-silence timing"""
+    set_at = 0.0
+    
+    def set(self):
+        self.set_at = time.perf_counter()
+        super().set()
+
+class SpeechWorker:
+    """Long-lived TTS threads: one owns the pyttsx3 engine, one plays the audio.
+    
+    pyttsx3 engines must stay on the thread that created them, so everything touching the
+    engine happens in _run. With a PyAudio instance, each utterance is rendered to PCM there
+    (or taken from the TtsCache) and handed to _play_loop, which writes it to one long-lived
+    output stream TTS_PLAY_CHUNK frames at a time and checks for interrupts between writes, so
+    a barge-in silences it within a chunk. The next sentence renders while this one plays.
+    Without PyAudio, pyttsx3 speaks directly and stops at the next word. say() returns an
+    Event that is set once the utterance is done (spoken, cancelled or failed)."""
+    
+    def __init__(self, interrupt: threading.Event, on_start=None, on_finish=None,
+                 pa=None, cache: Optional[TtsCache] = None):
+        self.interrupt = interrupt
+        self.on_start = on_start or (lambda: None)
+        self.on_finish = on_finish or (lambda: None)
+        self.queue = queue.Queue()  # Text to say: (text, generation, done, queued_at)
+        self.clips = queue.Queue()  # Rendered audio to play: (clip, generation, done, queued_at)
+        self.generation = 0  # Bumped by cancel(), anything queued under an older generation is dropped
+        self.cancelled_at = 0.0
+        self.current = None  # Generation pyttsx3 is speaking directly
+        self.pa, self.cache = pa, cache if pa else None
+        self.chunked = pa is not None
+        self.out, self.out_format = None, None  # Output stream, reopened if the clip format changes
+        self.voice = ""
+        self.renders = deque()  # Phrases to cache when idle
+        self.seen = OrderedDict()  # Recent uncached phrases, a second sighting gets it cached
+        self.rendering = False
+        self.last_barge_in = None  # Seconds from the last interrupt/cancel to silence
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.player = threading.Thread(target=self._play_loop, daemon=True)
+        if self.chunked:
+            self.player.start()
+    
+    def say(self, text: str) -> threading.Event:
+        """Queue an utterance, returns a handle that is set when it has finished"""
+        done = threading.Event()
+        self.queue.put((text, self.generation, done, time.perf_counter()))
+        return done
+    
+    def cancel(self):
+        """Stop the current utterance and drop everything queued, rendered or not"""
+        self.cancelled_at = time.perf_counter()
+        self.generation += 1
+        for pending in (self.queue, self.clips):
+            stop = False
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None or item[0] is None:  # Shutdown markers stay, cancel may race shutdown()
+                    stop = item
+                    continue
+                item[2].set()
+            if stop is not False:
+                pending.put(stop)
+    
+    def prerender(self, texts):
+        """Render phrases into the cache in the background, ahead of their first use"""
+        if self.cache:
+            self.renders.extend(texts)
+            self.queue.put(("", self.generation, threading.Event(), 0.0))  # Wake the worker
+    
+    def shutdown(self):
+        self.cancel()
+        self.queue.put((None, self.generation, threading.Event(), 0.0))
+        self.thread.join(timeout=2.0)  # Let the player close the output stream before PyAudio goes away
+        if self.chunked:
+            self.player.join(timeout=2.0)
+    
+    def _stale(self, generation: Optional[int] = None) -> bool:
+        generation = self.current if generation is None else generation
+        return self.interrupt.is_set() or (generation is not None and generation != self.generation)
+    
+    def _on_word(self, name, location, length):
+        if not self.rendering and self._stale():
+            self.engine.stop()
+    
+    def _worth_caching(self, text: str) -> bool:
+        """Short phrases get cached the second time they're said"""
+        if not self.cache or len(text) > TTS_CACHE_MAX_CHARS:
+            return False
+        self.seen[text] = self.seen.pop(text, 0) + 1
+        if self.seen[text] >= 2:
+            del self.seen[text]
+            return True
+        if len(self.seen) > 256:
+            self.seen.popitem(last=False)
+        return False
+    
+    def _render(self, text: str, path: Path):
+        self.rendering = True
         try:
-            import winsound
-            for _ in range(3):
-                winsound.Beep(1000, 500)
-                time.sleep(0.2)
-        except:
-            for _ in range(3):
-                print('\a', end='', flush=True)
-                time.sleep(0.5)
+            with metrics.span("tts_render"):
+                self.engine.save_to_file(text, str(path))
+                self.engine.runAndWait()
+        finally:
+            self.rendering = False
     
-    def get_weather(self) -> str:
-        """Get current weather information"""
-        if not WEATHER_API_KEY:
-            return "Weather API key not set. Get a free key at openweathermap.org and set OPENWEATHER_API_KEY environment variable."
+    def _synthesize(self, text: str) -> TtsClip:
+        """PCM for text, from the cache or rendered now. Raises if the driver can't render to WAV"""
+        key = TtsCache.key(text, self.voice, VOICE_RATE)
+        if self.cache and len(text) <= TTS_CACHE_MAX_CHARS:
+            clip = self.cache.get(key)
+            if clip:
+                return clip
         
+        path = self.cache.part_path(key) if self.cache else Path(tempfile.gettempdir()) / f"arthur_tts_{key}.wav"
+        self._render(text, path)
+        clip = read_clip(path)
+        if not (self._worth_caching(text) and self.cache.put(key, path)):
+            path.unlink(missing_ok=True)
+        return clip
+    
+    def _prerender(self, text: str):
+        key = TtsCache.key(text, self.voice, VOICE_RATE)
+        if key in self.cache:
+            return
         try:
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={WEATHER_LOCATION}&appid={WEATHER_API_KEY}&units=metric"
-            response = requests.get(url, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                temp = data['main']['temp']
-                feels = data['main']['feels_like']
-                desc = data['weather'][0]['description']
-                humidity = data['main']['humidity']
-                
-                return f"It's {temp:.0f}°C in Noels Pond, feels like {feels:.0f}°C. {desc.capitalize()}. Humidity {humidity}%."
-            else:
-                return "Couldn't fetch weather right now. Check your API key or internet connection."
+            self._render(text, self.cache.part_path(key))
+            self.cache.put(key, self.cache.part_path(key))
         except Exception as e:
-            return f"Weather check failed: {str(e)}"
+            print(f"⚠️ Speech cache render error: {e}")
     
-    def get_forecast(self) -> str:
-        """Get weekend/multi-day weather forecast"""
-        if not WEATHER_API_KEY:
-            return "Weather API key not set."
-        
+    def _speak(self, text: str, generation: int, done: threading.Event, queued_at: float):
+        """Direct pyttsx3 playback (no PyAudio, or a driver that can't render to WAV)"""
+        self.current = generation
         try:
-            url = f"http://api.openweathermap.org/data/2.5/forecast?q={WEATHER_LOCATION}&appid={WEATHER_API_KEY}&units=metric"
-            response = requests.get(url, timeout=5)
+            metrics.observe("tts_queue", time.perf_counter() - queued_at)
+            self.on_start()
+            with metrics.span("tts"):
+                self.engine.say(text)
+                self.engine.runAndWait()
+        except Exception as e:
+            print(f"❌ TTS error: {e}")
+        finally:
+            self.current = None
+            done.set()
+            if self.queue.empty():
+                self.on_finish()
+    
+    def _run(self):
+        try:
+            self.engine = pyttsx3.init()
+            self.engine.setProperty('rate', VOICE_RATE)
+            self.engine.setProperty('volume', 1.0)
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Get today's day number (0=Monday, 6=Sunday)
-                today = datetime.now().weekday()
-                
-                # Calculate days until Saturday (5) and Sunday (6)
-                days_to_saturday = (5 - today) % 7
-                days_to_sunday = (6 - today) % 7
-                
-                # If it's already Saturday or Sunday, use today/tomorrow
-                if today == 5:  # Saturday
-                    days_to_saturday = 0
-                    days_to_sunday = 1
-                elif today == 6:  # Sunday
-                    days_to_saturday = 6
-                    days_to_sunday = 0
+            voices = self.engine.getProperty('voices')
+            if voices:
+                self.engine.setProperty('voice', voices[0].id)
+                self.voice = voices[0].id
+            
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            print(f"❌ TTS init error: {e}")
+            return
+        
+        while True:
+            if self.renders and self.queue.empty():
+                self._prerender(self.renders.popleft())
+                continue
+            
+            text, generation, done, queued_at = self.queue.get()
+            if text is None:
+                break
+            if not text:
+                continue
+            if self._stale(generation):
+                print("   ⚠️ Interrupted!")
+                done.set()
+                continue
+            
+            if self.chunked:
+                try:
+                    self.clips.put((self._synthesize(text), generation, done, queued_at))
+                    continue
+                except Exception as e:
+                    print(f"⚠️ Can't render speech to PCM ({e}), letting pyttsx3 play it directly")
+                    self.chunked = False
+            self._speak(text, generation, done, queued_at)
+        
+        self.clips.put(None)
+    
+    def _play_loop(self):
+        while True:
+            item = self.clips.get()
+            if item is None:
+                break
+            
+            clip, generation, done, queued_at = item
+            try:
+                if self._stale(generation):
+                    print("   ⚠️ Interrupted!")
+                else:
+                    metrics.observe("tts_queue", time.perf_counter() - queued_at)
+                    self.on_start()
+                    with metrics.span("tts"):
+                        self._play(clip, generation)
+            except Exception as e:
+                print(f"❌ TTS playback error: {e}")
+            finally:
+                done.set()
+                if self.clips.empty() and self.queue.empty():
+                    self.on_finish()
+        
+        self._close_output()
+    
+    def _play(self, clip: TtsClip, generation: int):
+        """Write a clip to the output stream, stopping between chunks if interrupted"""
+        fmt = (clip.width, clip.channels, clip.rate)
+        if self.out is None or self.out_format != fmt:
+            self._close_output()
+            self.out = self.pa.open(format=self.pa.get_format_from_width(clip.width), channels=clip.channels,
+                                    rate=clip.rate, output=True, frames_per_buffer=TTS_PLAY_CHUNK)
+            self.out_format = fmt
+        
+        step = TTS_PLAY_CHUNK * clip.width * clip.channels
+        for i in range(0, len(clip.frames), step):
+            if self._stale(generation):
+                self._silenced()
+                return
+            self.out.write(clip.frames[i:i + step])
+    
+    def _silenced(self):
+        """Playback stopped mid-clip: time it from the stop request and drop everything still queued"""
+        requested = self.interrupt.set_at if self.interrupt.is_set() and getattr(self.interrupt, "set_at", 0) \
+            else self.cancelled_at
+        # Audio already handed to the device still plays for the output latency
+        self.last_barge_in = time.perf_counter() - requested + self.out.get_output_latency()
+        metrics.observe("barge_in", self.last_barge_in)
+        print(f"   🔇 Silenced {self.last_barge_in * 1000:.0f}ms after the interrupt")
+        self.cancel()
+    
+    def _close_output(self):
+        if self.out:
+            self.out.stop_stream()
+            self.out.close()
+            self.out = None
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# ⏰ ALARMS & TIMERS
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class Scheduler:
+    """Min-heap of alarms/timers keyed on due time.
+    
+    One thread sleeps on a condition variable exactly until the next deadline (or until
+    something earlier is added). Cancelled entries are dropped from the id map right away
+    and skipped lazily when they reach the top of the heap. Fired entries go to self.fired
+    as (kind, due, label) so announcing them never happens under the lock."""
+    
+    def __init__(self):
+        self.heap = []  # [due_timestamp, id]
+        self.entries = {}  # id -> (due_timestamp, kind, label)
+        self.ids = itertools.count(1)
+        self.cond = threading.Condition()
+        self.fired = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+    
+    def add(self, due: datetime, kind: str, label: str = "") -> int:
+        """Schedule an entry, returns its id"""
+        with self.cond:
+            entry_id = next(self.ids)
+            due_ts = due.timestamp()
+            self.entries[entry_id] = (due_ts, kind, label)
+            heapq.heappush(self.heap, (due_ts, entry_id))
+            if self.heap[0][1] == entry_id:  # New earliest deadline, wake the scheduler
+                self.cond.notify()
+            return entry_id
+    
+    def cancel(self, entry_id: int) -> Optional[tuple]:
+        """Cancel by id, returns (due, kind, label) or None if it already fired or never existed"""
+        with self.cond:
+            entry = self.entries.pop(entry_id, None)
+            self._compact()
+        if entry is None:
+            return None
+        due_ts, kind, label = entry
+        return datetime.fromtimestamp(due_ts), kind, label
+    
+    def clear(self, kind: str) -> int:
+        """Cancel every entry of one kind, returns how many were removed"""
+        with self.cond:
+            ids = [entry_id for entry_id, (_, k, _) in self.entries.items() if k == kind]
+            for entry_id in ids:
+                del self.entries[entry_id]
+            self._compact()
+            return len(ids)
+    
+    def pending(self, kind: str) -> list:
+        """Pending entries of one kind as (due, label, id), soonest first"""
+        with self.cond:
+            items = [(due_ts, label, entry_id) for entry_id, (due_ts, k, label) in self.entries.items() if k == kind]
+        return [(datetime.fromtimestamp(due_ts), label, entry_id) for due_ts, label, entry_id in sorted(items)]
+    
+    def _compact(self):
+        # Rebuild once cancelled leftovers dominate the heap, keeps memory and pops bounded
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self.entries):
+            self.heap = [item for item in self.heap if item[1] in self.entries]
+            heapq.heapify(self.heap)
+    
+    def _run(self):
+        with self.cond:
+            while True:
+                while self.heap and self.heap[0][1] not in self.entries:
+                    heapq.heappop(self.heap)
                 
-                saturday = datetime.now() + timedelta(days=days_to_saturday)
-                sunday = datetime.now() + timedelta(days=days_to_sunday)
+                if not self.heap:
+                    self.cond.wait()
+                    continue
                 
-                # Find forecasts for Saturday and Sunday (around noon)
-                saturday_data = None
-                sunday_data = None
+                delay = self.heap[0][0] - time.time()
+                if delay > 0:
+                    self.cond.wait(delay)
+                    continue
                 
-                for forecast in data['list']:
-                    forecast_time = datetime.fromtimestamp(forecast['dt'])
-                    
-                    # Look for forecast around noon (12:00)
-                    if forecast_time.date() == saturday.date() and 10 <= forecast_time.hour <= 14:
-                        if not saturday_data:
-                            saturday_data = forecast
-                        else:
-                            # Pick the one closest to noon
-                            current_diff = abs(forecast_time.hour - 12)
-                            prev_time = datetime.fromtimestamp(saturday_data['dt'])
-                            prev_diff = abs(prev_time.hour - 12)
-                            if current_diff < prev_diff:
-                                saturday_data = forecast
-                    
-                    if forecast_time.date() == sunday.date() and 10 <= forecast_time.hour <= 14:
-                        if not sunday_data:
-                            sunday_data = forecast
+                _, entry_id = heapq.heappop(self.heap)
+                due_ts, kind, label = self.entries.pop(entry_id)
+                self.fired.put((kind, datetime.fromtimestamp(due_ts), label))
+                metrics.inc(f"{kind.rpartition('/')[2]}_fires")
+
+class SessionScheduler:
+    """One server session's view of the shared Scheduler: same API, kinds namespaced as '<session>/<kind>'"""
+    
+    def __init__(self, scheduler: Scheduler, session_id: str):
+        self.scheduler = scheduler
+        self.prefix = f"{session_id}/"
+    
+    def add(self, due: datetime, kind: str, label: str = "") -> int:
+        return self.scheduler.add(due, self.prefix + kind, label)
+    
+    def cancel(self, entry_id: int) -> Optional[tuple]:
+        with self.scheduler.cond:
+            entry = self.scheduler.entries.get(entry_id)
+        if entry is None or not entry[1].startswith(self.prefix):
+            return None
+        return self.scheduler.cancel(entry_id)
+    
+    def clear(self, kind: str) -> int:
+        return self.scheduler.clear(self.prefix + kind)
+    
+    def pending(self, kind: str) -> list:
+        return self.scheduler.pending(self.prefix + kind)
+    
+    def clear_all(self) -> int:
+        return self.clear("alarm") + self.clear("timer")
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🌐 HTTP
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class HttpClient:
+    """One shared requests.Session for every API call: pooled keep-alive connections (so
+    TCP/TLS handshakes happen once), per-endpoint timeouts, gzip, and retry with backoff
+    on connection errors only (a request that never connected is safe to resend)."""
+    
+    def __init__(self):
+        self.session = requests.Session()
+        retry = Retry(total=HTTP_RETRIES, connect=HTTP_RETRIES, read=0, status=0, other=0,
+                      backoff_factor=HTTP_BACKOFF, allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+    
+    def get(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", HTTP_TIMEOUTS[endpoint])
+        return self.session.get(url, **kwargs)
+    
+    def post(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", HTTP_TIMEOUTS[endpoint])
+        return self.session.post(url, **kwargs)
+    
+    def warm(self, *urls: str):
+        """Open pooled connections in the background so the first real request skips the handshake"""
+        def connect(url):
+            try:
+                self.session.head(url, timeout=HTTP_TIMEOUTS["warm"]).close()
+            except Exception:
+                pass
+        
+        for url in urls:
+            threading.Thread(target=connect, args=(url,), daemon=True).start()
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🔀 BACKEND ROUTER
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class BackendUnavailable(Exception):
+    """Every LLM backend failed for this request"""
+
+class BackendRouter:
+    """Picks the LLM backend for each request from rolling health stats.
+    
+    Every backend keeps its last BACKEND_WINDOW outcomes. BREAKER_FAILURES failures in a row, or
+    an error rate over BREAKER_ERROR_RATE, open its circuit: requests skip it and a background
+    probe checks it again after BREAKER_COOLDOWN (doubling while it keeps failing), closing the
+    circuit once it answers. Healthy backends are tried in preference order, except that one
+    whose median time to first token is over BACKEND_SLOW_MS goes behind faster healthy ones."""
+    
+    def __init__(self, preference: list, probes: dict):
+        self.preference = preference  # Backend names, preferred first
+        self.probes = probes  # name -> () -> bool
+        self.lock = threading.Lock()
+        self.outcomes = {name: deque(maxlen=BACKEND_WINDOW) for name in preference}  # (ok, first_token_seconds)
+        self.failures = {name: 0 for name in preference}  # In a row
+        self.open_until = {name: 0.0 for name in preference}  # 0 while the circuit is closed
+        self.cooldown = {name: BREAKER_COOLDOWN for name in preference}
+        self.wake = threading.Event()
+    
+    def start(self):
+        threading.Thread(target=self._probe_loop, daemon=True).start()
+    
+    def order(self) -> list:
+        """Backends to try for the next request, best first"""
+        with self.lock:
+            healthy = [name for name in self.preference if not self.open_until[name]]
+            if not healthy:  # Everything is down, still give the preferred one a go
+                return list(self.preference)
+            return sorted(healthy, key=lambda name: self._median(name) > BACKEND_SLOW_MS / 1000)
+    
+    def primary(self) -> Optional[str]:
+        order = self.order()
+        return order[0] if order else None
+    
+    def healthy(self, name: str) -> bool:
+        with self.lock:
+            return name in self.open_until and not self.open_until[name]
+    
+    def record(self, name: str, ok: bool, first_token: Optional[float] = None):
+        """Outcome of one request: ok with its time to first token, or failed"""
+        if first_token is not None:
+            metrics.observe(f"{name}_first_token", first_token)
+        with self.lock:
+            window = self.outcomes[name]
+            window.append((ok, first_token))
+            if ok:
+                self.failures[name] = 0
+                if self.open_until[name]:
+                    self._close(name)
+                return
+            
+            self.failures[name] += 1
+            metrics.inc(f"{name}_errors")
+            error_rate = sum(1 for good, _ in window if not good) / len(window)
+            if not self.open_until[name] and (self.failures[name] >= BREAKER_FAILURES or
+                                              (len(window) >= BACKEND_WINDOW // 2 and error_rate > BREAKER_ERROR_RATE)):
+                self._open(name)
+    
+    def trip(self, name: str):
+        """Open a backend's circuit straight away, e.g. when it fails the startup check"""
+        with self.lock:
+            if not self.open_until[name]:
+                self._open(name)
+    
+    def summary(self) -> dict:
+        with self.lock:
+            return {name: {"state": "open" if self.open_until[name] else "closed",
+                           "p50_first_token_ms": round(self._median(name) * 1000, 1),
+                           "error_rate": round(sum(1 for ok, _ in self.outcomes[name] if not ok) / max(len(self.outcomes[name]), 1), 3)}
+                    for name in self.preference}
+    
+    def _median(self, name: str) -> float:
+        latencies = sorted(t for ok, t in self.outcomes[name] if ok and t is not None)
+        return latencies[len(latencies) // 2] if latencies else 0.0
+    
+    def _open(self, name: str):
+        self.open_until[name] = time.time() + self.cooldown[name]
+        print(f"🔌 {name} circuit open, probing again in {self.cooldown[name]:.0f}s")
+        metrics.inc("breaker_opens")
+        self.wake.set()
+    
+    def _close(self, name: str):
+        self.open_until[name] = 0.0
+        self.failures[name] = 0
+        self.cooldown[name] = BREAKER_COOLDOWN
+        self.outcomes[name].clear()  # Start the error rate afresh
+        print(f"🔌 {name} is back")
+    
+    def _probe_loop(self):
+        """Re-check open circuits once their cooldown is up"""
+        while True:
+            with self.lock:
+                due = [name for name, until in self.open_until.items() if until and until <= time.time()]
+                waits = [until - time.time() for until in self.open_until.values() if until]
+            
+            for name in due:
+                ok = self.probes[name]()
+                with self.lock:
+                    if ok:
+                        self._close(name)
+                    else:
+                        self.cooldown[name] = min(self.cooldown[name] * 2, BREAKER_MAX_COOLDOWN)
+                        self.open_until[name] = time.time() + self.cooldown[name]
+            
+            if not due:
+                self.wake.wait(max(0.0, min(waits)) if waits else None)
+                self.wake.clear()
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🌦️ WEATHER
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class WeatherCache:
+    """TTL cache for weather API responses, refreshed in the background before they expire.
+    
+    Readers only ever look at what is cached, so they never wait on the network. When a
+    refresh fails the last good response keeps being served and get() reports its age."""
+    
+    def __init__(self):
+        self.sources = {}  # name -> (fetch, ttl)
+        self.values = {}  # name -> (data, fetched_at)
+        self.next_refresh = {}
+        self.ready = {}  # name -> Event, set once the first fetch has been tried (a failing API isn't waited on again)
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+    
+    def register(self, name: str, fetch, ttl: float):
+        self.sources[name] = (fetch, ttl)
+        self.next_refresh[name] = 0
+        self.ready[name] = threading.Event()
+    
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+    
+    def get(self, name: str, wait: float = 0.0):
+        """Cached (data, age_seconds) or (None, None) if nothing was fetched yet; optionally wait for the first attempt"""
+        if wait > 0:
+            self.ready[name].wait(wait)
+        with self.lock:
+            entry = self.values.get(name)
+        if entry is None:
+            metrics.inc("weather_cache_misses")
+            return None, None
+        metrics.inc("weather_cache_hits")
+        data, fetched_at = entry
+        return data, time.time() - fetched_at
+    
+    def _run(self):
+        while True:
+            for name, (fetch, ttl) in self.sources.items():
+                if time.time() < self.next_refresh[name]:
+                    continue
+                try:
+                    data = fetch()
+                    with self.lock:
+                        self.values[name] = (data, time.time())
+                    self.next_refresh[name] = time.time() + ttl * WEATHER_REFRESH_AT
+                except Exception as e:
+                    print(f"⚠️ {name.capitalize()} refresh failed: {e}")
+                    self.next_refresh[name] = time.time() + min(WEATHER_RETRY, ttl)
+                self.ready[name].set()
+            
+            self.wake.wait(max(0.0, min(self.next_refresh.values()) - time.time()))
+            self.wake.clear()
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 💾 RESPONSE CACHE
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+FOLLOW_UP_RE = re.compile(r"\b(?:that|this|those|these|he|she|him|her|his|they|them|their|again|another|more|else|"
+                          r"instead|earlier|before|previous|you said|why|what about|how about|and)\b")
+TIME_WORDS_RE = re.compile(r"\b(?:time|clock|date|days?|today|tonight|tomorrow|yesterday|now|week|month|year|"
+                           r"hours?|minutes?)\b")
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase, drop punctuation and 'please', collapse whitespace"""
+    words = re.sub(r"[^\w'\s]", " ", text.lower()).split()
+    return " ".join(w for w in words if w != "please")
+
+class ResponseCache:
+    """LRU cache of LLM replies keyed by normalized prompt + context fingerprint, persisted as JSON.
+    
+    Each entry carries its own expiry, so a reply that mentions the time is only reused within
+    the minute, while a joke can be reused all day. Expired entries are dropped lazily on lookup."""
+    
+    def __init__(self, path: str = RESPONSE_CACHE_FILE, size: int = RESPONSE_CACHE_SIZE):
+        self.path, self.size = Path(path), size
+        self.entries = OrderedDict()  # key -> (reply, expires_at), least recently used first
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0}
+        self._load()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[1] <= time.time():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self._count("misses")
+                return None
+            self.entries.move_to_end(key)
+            self._count("hits")
+            return entry[0]
+    
+    def put(self, key: str, reply: str, ttl: float):
+        with self.lock:
+            self.entries[key] = (reply, time.time() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+            snapshot = list(self.entries.items())
+        self._save(snapshot)
+    
+    def bypass(self):
+        """Count a prompt that skipped the cache (its reply depends on the conversation)"""
+        with self.lock:
+            self._count("bypassed")
+    
+    def summary(self) -> str:
+        with self.lock:
+            hits, misses, bypassed = self.stats["hits"], self.stats["misses"], self.stats["bypassed"]
+            size = len(self.entries)
+        rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+        return f"{hits} hits, {misses} misses ({rate:.0f}% hit rate), {bypassed} bypassed, {size} cached"
+    
+    def _count(self, stat: str):
+        self.stats[stat] += 1
+        metrics.inc(f"response_cache_{stat}")
+    
+    def _load(self):
+        try:
+            now = time.time()
+            for key, reply, expires_at in json.loads(self.path.read_text(encoding="utf-8")):
+                if expires_at > now:
+                    self.entries[key] = (reply, expires_at)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Response cache unreadable, starting empty: {e}")
+    
+    def _save(self, snapshot):
+        try:
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps([[key, reply, expires_at] for key, (reply, expires_at) in snapshot]),
+                           encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as e:
+            print(f"⚠️ Response cache save error: {e}")
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🧠 MEMORY
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+MEMORY_STOPWORDS = frozenset("a an the is are was were be to of in on at for and or but it its i you me my your "
+                             "we he she they them this that what what's who how do does did can could would "
+                             "should will just so about".split())
+MEMORY_SUFFIX_RE = re.compile(r"(?<=\w{3})(?:ing|ed|es|s)$")
+
+def embed_text(text: str, dim: int = MEMORY_EMBED_DIM) -> np.ndarray:
+    """Hashed bag of (crudely stemmed) words and word pairs, L2-normalized (deterministic, no model needed)"""
+    words = [MEMORY_SUFFIX_RE.sub("", w) for w in normalize_prompt(text).split() if w not in MEMORY_STOPWORDS]
+    vec = np.zeros(dim, dtype=np.float32)
+    for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        h = zlib.crc32(feature.encode())
+        vec[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+class ConversationMemory:
+    """Every turn, kept in an append-only SQLite table and an in-memory embedding matrix.
+    
+    Writes are batched on a background thread. Lookups never touch the database: vectors are
+    stored one row per dimension, so scoring every stored turn only reads the few rows where
+    the (sparse, hashed) prompt vector is nonzero. pack() fills the token budget with the
+    latest turns first, then the most relevant older ones."""
+    
+    def __init__(self, path: str = MEMORY_DB, dim: int = MEMORY_EMBED_DIM):
+        self.path, self.dim = path, dim
+        self.lock = threading.Lock()
+        self.turns = []  # (user, assistant), oldest first, column i of self.vectors
+        self.vectors = np.zeros((dim, 1024), dtype=np.float32)
+        self.pending = queue.Queue()
+        self._load()
+        self.writer = threading.Thread(target=self._write_behind, daemon=True)
+        self.writer.start()
+    
+    def add(self, user: str, assistant: str):
+        vec = embed_text(user, self.dim)  # Turns are found by what the user said
+        with self.lock:
+            n = len(self.turns)
+            if n == self.vectors.shape[1]:
+                self.vectors = np.concatenate([self.vectors, np.zeros_like(self.vectors)], axis=1)
+            self.vectors[:, n] = vec
+            self.turns.append((user, assistant))
+        self.pending.put(("turn", (time.time(), user, assistant, vec.tobytes())))
+    
+    def clear(self) -> int:
+        """Forget everything so far. Rows stay on disk, a marker hides them from the next load"""
+        with self.lock:
+            count = len(self.turns)
+            self.turns = []
+            self.vectors = np.zeros((self.dim, 1024), dtype=np.float32)  # New arrays, snapshots keep the old ones
+        self.pending.put(("clear", time.time()))
+        return count
+    
+    def _snapshot(self) -> tuple:
+        """(turns, count, vectors) as of now. add() only appends and clear() swaps in new objects,
+        so the first count turns and vector columns stay as they are"""
+        with self.lock:
+            return self.turns, len(self.turns), self.vectors
+    
+    def search(self, query: str, k: int = MEMORY_TOP_K, skip_recent: int = 0) -> list:
+        """[(turn index, cosine score)] of the k most similar turns, best first, leaving out the newest skip_recent"""
+        _, n, vectors = self._snapshot()
+        return self._rank(query, vectors, n - skip_recent, k)
+    
+    def _rank(self, query: str, vectors: np.ndarray, n: int, k: int) -> list:
+        q = embed_text(query, self.dim)
+        dims = np.flatnonzero(q)
+        if n <= 0 or not len(dims):
+            return []
+        
+        scores = q[dims] @ vectors[dims, :n]
+        top = np.flatnonzero(scores >= MEMORY_MIN_SCORE)  # Usually a small fraction, cheaper to rank
+        if len(top) > k:
+            top = top[np.argpartition(scores[top], len(top) - k)[-k:]]
+        top = top[np.lexsort((-top, -scores[top]))]  # Best score first, newer turn first on ties
+        return [(int(i), float(scores[i])) for i in top]
+    
+    def pack(self, prompt: str, budget: int = MEMORY_TOKEN_BUDGET) -> list:
+        """[(user, assistant)] for the prompt, oldest first: recent turns, then relevant older ones, within budget"""
+        turns, n, vectors = self._snapshot()  # Both passes use it, so search indices always point at these turns
+        chosen, used = set(), 0
+        
+        for i in range(n - 1, max(n - MEMORY_RECENT, 0) - 1, -1):
+            cost = self._tokens(turns[i])
+            if used + cost > budget:
+                break
+            chosen.add(i)
+            used += cost
+        
+        for i, _ in self._rank(prompt, vectors, n - MEMORY_RECENT, MEMORY_TOP_K):
+            cost = self._tokens(turns[i])
+            if used + cost <= budget:
+                chosen.add(i)
+                used += cost
+        return [turns[i] for i in sorted(chosen)]
+    
+    def flush(self):
+        """Block until every queued write is on disk"""
+        self.pending.join()
+    
+    def close(self):
+        self.pending.put(None)
+        self.writer.join(timeout=5)
+    
+    @staticmethod
+    def _tokens(turn) -> int:
+        return (len(turn[0]) + len(turn[1])) // 4 + 8  # ~4 characters per token, plus message overhead
+    
+    def _connect(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS turns (id INTEGER PRIMARY KEY, ts REAL NOT NULL, "
+                   "user TEXT NOT NULL, assistant TEXT NOT NULL, embedding BLOB NOT NULL)")
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return db
+    
+    def _load(self):
+        db = self._connect()
+        try:
+            row = db.execute("SELECT value FROM meta WHERE key = 'cleared_at'").fetchone()
+            rows = db.execute("SELECT user, assistant, embedding FROM turns WHERE ts > ? ORDER BY id",
+                              (float(row[0]) if row else 0.0,)).fetchall()
+        finally:
+            db.close()
+        
+        size = self.dim * 4
+        self.vectors = np.zeros((self.dim, max(1024, 1 << len(rows).bit_length())), dtype=np.float32)
+        if all(len(blob) == size for _, _, blob in rows):
+            self.vectors[:, :len(rows)] = np.frombuffer(b"".join(blob for _, _, blob in rows), dtype=np.float32).reshape(-1, self.dim).T
+        else:  # Saved with a different MEMORY_EMBED_DIM, re-embed
+            for i, (user, assistant, _) in enumerate(rows):
+                self.vectors[:, i] = embed_text(user, self.dim)
+        self.turns = [(user, assistant) for user, assistant, _ in rows]
+    
+    def _write_behind(self):
+        """Write queued turns in batches: one transaction per MEMORY_FLUSH_BATCH turns or MEMORY_FLUSH_INTERVAL"""
+        db = self._connect()
+        while True:
+            batch = [self.pending.get()]
+            deadline = time.time() + MEMORY_FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < MEMORY_FLUSH_BATCH:
+                try:
+                    batch.append(self.pending.get(timeout=max(0.0, deadline - time.time())))
+                except queue.Empty:
+                    break
+            
+            try:
+                with db:
+                    for item in batch:
+                        if item is None:
+                            continue
+                        kind, data = item
+                        if kind == "turn":
+                            db.execute("INSERT INTO turns (ts, user, assistant, embedding) VALUES (?, ?, ?, ?)", data)
                         else:
-                            # Pick the one closest to noon
-                            current_diff = abs(forecast_time.hour - 12)
-                            prev_time = datetime.fromtimestamp(sunday_data['dt'])
-                            prev_diff = abs(prev_time.hour - 12)
-                            if current_diff < prev_diff:
-                                sunday_data = forecast
+                            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('cleared_at', ?)", (str(data),))
+            except Exception as e:
+                print(f"⚠️ Memory write error: {e}")
+            
+            for _ in batch:
+                self.pending.task_done()
+            if batch[-1] is None:
+                db.close()
+                return
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🧭 COMMAND ROUTER
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+NUMBER_WORDS = {
+    'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
+    'eleven': '11', 'twelve': '12', 'thirteen': '13', 'fourteen': '14', 'fifteen': '15',
+    'sixteen': '16', 'seventeen': '17', 'eighteen': '18', 'nineteen': '19', 'twenty': '20',
+    'twenty-one': '21', 'twenty-two': '22', 'twenty-three': '23', 'twenty-four': '24',
+    'twenty-five': '25', 'twenty-six': '26', 'twenty-seven': '27', 'twenty-eight': '28',
+    'twenty-nine': '29', 'thirty': '30', 'forty': '40', 'fifty': '50', 'sixty': '60',
+    'a': '1', 'an': '1'
+}
+
+def _word_alternation(words) -> str:
+    # Longest first so 'twenty-one' wins over 'twenty' at the same position
+    return r'\b(?:' + '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True)) + r')\b'
+
+NUMBER_WORD_RE = re.compile(_word_alternation(NUMBER_WORDS))
+ALARM_LABEL_RE = re.compile(_word_alternation(['am', 'pm', 'o\'clock', 'oclock', *NUMBER_WORDS]), re.IGNORECASE)
+TIMER_LABEL_RE = re.compile(_word_alternation(['minutes', 'minute', 'min', 'hours', 'hour', 'hr', 'seconds', 'second',
+                                               'sec', 'timer', *NUMBER_WORDS]), re.IGNORECASE)
+TIMER_POSITION_RE = re.compile(r'(?:timer\s*)?(?:number\s*)?(\d+|first|second|third|last)')
+
+TIME_HM_PERIOD_RE = re.compile(r'(\d{1,2}):(\d{2})\s*(AM|PM)')
+TIME_H_PERIOD_RE = re.compile(r'(\d{1,2})\s*(AM|PM)')
+TIME_HM_RE = re.compile(r'(\d{1,2}):(\d{2})')
+DURATION_RES = [(re.compile(r'(\d+)\s*(?:hour|hr)s?'), 3600),
+                (re.compile(r'(\d+)\s*(?:minute|min)s?'), 60),
+                (re.compile(r'(\d+)\s*(?:second|sec)s?'), 1)]
+
+# Intent table, checked in order, first match wins: (intent, required keyword, any of these keywords).
+# Keywords are plain substrings of the lowercased command, same as the old `in lower` checks.
+INTENTS = [
+    ("clear_history", None, {'reset history', 'clear history', 'forget everything', 'clear memory', 'reset memory'}),
+    ("set_alarm", 'alarm', {'set', 'create', 'for', 'at'}),
+    ("list_alarms", 'alarm', {'list', 'show', 'what'}),
+    ("clear_alarms", 'alarm', {'clear', 'delete', 'remove', 'cancel'}),
+    ("set_timer", 'timer', {'set', 'create', 'for', 'start'}),
+    ("list_timers", 'timer', {'list', 'show', 'what', 'check'}),
+    ("clear_timers", 'timer', {'clear', 'delete', 'remove', 'cancel', 'stop'}),
+]
+ROUTER_KEYWORDS = {kw for _, required, any_of in INTENTS for kw in any_of | {required} if kw} | {'all'}
+
+# One lookahead scan finds every keyword occurrence, overlapping ones included ('at' inside 'what').
+# Where one keyword is a prefix of another at the same position, the longer one matches and
+# implies the shorter ('forget everything' also counts as 'for').
+ROUTER_RE = re.compile('(?=(' + '|'.join(re.escape(k) for k in sorted(ROUTER_KEYWORDS, key=len, reverse=True)) + '))')
+ROUTER_IMPLIES = {k: frozenset(p for p in ROUTER_KEYWORDS if k.startswith(p)) for k in ROUTER_KEYWORDS}
+
+class Intent(NamedTuple):
+    """A routed command: intent name, original text, lowercased text and the keywords found"""
+    name: str
+    text: str
+    lower: str
+    keywords: frozenset
+
+def word_to_number(text: str) -> str:
+    """Convert word numbers to digits (single pass)"""
+    return NUMBER_WORD_RE.sub(lambda m: NUMBER_WORDS[m.group(0)], text)
+
+def route(text: str) -> Optional[Intent]:
+    """Match a command against the intent table with one keyword scan"""
+    lower = text.lower()
+    found = set()
+    for match in ROUTER_RE.finditer(lower):
+        found |= ROUTER_IMPLIES[match.group(1)]
+    
+    for name, required, any_of in INTENTS:
+        if (required is None or required in found) and not any_of.isdisjoint(found):
+            return Intent(name, text, lower, frozenset(found))
+    return None
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🧩 CONTEXT
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class ContextBuilder:
+    """Runs the registered context providers for a prompt concurrently, each against its own deadline.
+    
+    A provider is fn(assistant, prompt) -> its piece of context ("" for nothing to add). One that
+    hasn't finished by its deadline is left out of this prompt, its result is dropped when it
+    does finish. Providers never fetch anything themselves: weather and forecast read the
+    WeatherCache, waiting only for its first fetch after startup."""
+    
+    def __init__(self, workers: int = CONTEXT_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="context")
+        self.providers = {}  # name -> (fn, deadline in seconds), in registration order
+    
+    def register(self, name: str, fn, deadline: Optional[float] = None):
+        self.providers[name] = (fn, CONTEXT_DEADLINES.get(name, 1.0) if deadline is None else deadline)
+    
+    def gather(self, assistant, prompt: str) -> tuple:
+        """({name: result} for providers that made their deadline, {name: seconds taken, None if skipped})"""
+        start = time.perf_counter()
+        futures = {name: (self.pool.submit(contextvars.copy_context().run, self._timed, name, fn, assistant, prompt), deadline)
+                   for name, (fn, deadline) in self.providers.items()}
+        
+        results, timings = {}, {}
+        for name, (future, deadline) in futures.items():
+            try:
+                results[name], timings[name] = future.result(timeout=max(0.0, start + deadline - time.perf_counter()))
+            except FutureTimeout:
+                timings[name] = None
+                metrics.inc(f"context_{name}_skipped")
+                print(f"   ⏭️ Skipped {name} context (over {deadline * 1000:.0f}ms)")
+            except Exception as e:
+                timings[name] = None
+                print(f"⚠️ {name} context error: {e}")
+        
+        metrics.observe("context", time.perf_counter() - start)
+        return results, timings
+    
+    @staticmethod
+    def _timed(name: str, fn, assistant, prompt: str):
+        start = time.perf_counter()
+        result = fn(assistant, prompt)
+        elapsed = time.perf_counter() - start
+        metrics.observe(f"context_{name}", elapsed)
+        return result, elapsed
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# ⚡ ASYNC RUNTIME
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+def _settle(loop, future, result=None, error=None):
+    """Resolve an asyncio future from a worker thread (dropped if it was cancelled or the loop is gone)"""
+    def resolve():
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    try:
+        loop.call_soon_threadsafe(resolve)
+    except RuntimeError:  # Loop already closed
+        pass
+
+def in_thread(fn, *args) -> asyncio.Future:
+    """Await a blocking call (Whisper, mic, pyttsx3 waits) run on a daemon thread.
+    
+    Daemon threads, unlike executor workers, never hold up exit while stuck on the mic or network."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def run():
+        try:
+            _settle(loop, future, result=fn(*args))
+        except BaseException as e:
+            _settle(loop, future, error=e)
+    
+    threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True).start()  # Keeps the metrics turn
+    return future
+
+async def iterate_in_thread(gen):
+    """Drive a blocking generator (an LLM token stream) on a daemon thread and yield its items.
+    
+    Closing this async generator, or cancelling the task iterating it, makes the thread close the
+    blocking generator after its current item, which closes the HTTP stream behind it."""
+    loop = asyncio.get_running_loop()
+    items = asyncio.Queue()
+    stop = threading.Event()
+    
+    def post(kind, value=None):
+        try:
+            loop.call_soon_threadsafe(items.put_nowait, (kind, value))
+        except RuntimeError:
+            pass
+    
+    def pump():
+        try:
+            for item in gen:
+                if stop.is_set():
+                    break
+                post("item", item)
+        except Exception as e:
+            post("error", e)
+        finally:
+            gen.close()
+            post("end")
+    
+    threading.Thread(target=contextvars.copy_context().run, args=(pump,), daemon=True).start()
+    try:
+        while True:
+            kind, value = await items.get()
+            if kind == "end":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stop.set()
+
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🤖 ASSISTANT
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class VoiceAssistant:
+    def __init__(self):
+        started = time.perf_counter()
+        self.startup_times = {}
+        
+        self.history = deque(maxlen=100)
+        self.loop = None  # Event loop the run_* coroutines run on
+        self.wake_events = None  # asyncio.Queue of wake word positions, fed by monitor_wake_word
+        self.turn = None  # Task handling the current voice turn
+        self.server = None  # ArthurServer, in server mode
+        self.interrupt = TimedEvent()
+        self.speaking = False
+        self.recording = False
+        self.running = True
+        self.voice_mode = VOICE_MODE
+        
+        # AI backends, chosen per request by the router
+        self.router = BackendRouter(["openai", "ollama"] if OPENAI_API_KEY else ["ollama"],
+                                    {"openai": self._check_openai, "ollama": self._check_ollama})
+        self.ollama_options = {"temperature": TEMP, "num_predict": MAX_TOKENS, "num_ctx": OLLAMA_NUM_CTX}
+        self.last_prompt_stats = {}
+        self.reply_source = None  # Where the last reply came from: "command", "cache", a backend name or "error"
+        self.last_context_timings = {}  # Seconds per context provider for the last LLM prompt, None if skipped
+        
+        # Context providers, run concurrently for every LLM prompt
+        self.context = ContextBuilder()
+        self.context.register("time", VoiceAssistant._time_context)
+        self.context.register("weather", VoiceAssistant._current_weather_context)
+        self.context.register("forecast", VoiceAssistant._forecast_context)
+        self.context.register("alarms", VoiceAssistant._alarms_context)
+        self.context.register("memory", VoiceAssistant._memory_context)
+        
+        # Shared keep-alive HTTP connections
+        self.http = HttpClient()
+        
+        # Backend probes run in the background while the audio side starts up
+        probes = ThreadPoolExecutor(max_workers=2)
+        openai_probe = probes.submit(self._timed, "openai check", self._check_openai) if OPENAI_API_KEY else None
+        ollama_probe = probes.submit(self._timed, "ollama check", self._check_ollama)
+        probes.shutdown(wait=False)
+        
+        # Alarms & Timers
+        self.scheduler = Scheduler()
+        
+        # Weather, fetched in the background so prompts never wait on it
+        self.weather_cache = WeatherCache()
+        self.weather_cache.register("weather", lambda: self._fetch_owm("weather"), WEATHER_TTL)
+        self.weather_cache.register("forecast", lambda: self._fetch_owm("forecast"), FORECAST_TTL)
+        if WEATHER_API_KEY:
+            self.weather_cache.start()
+        
+        # Conversation memory, kept across restarts
+        self.memory = self._timed("memory", ConversationMemory) if MEMORY_ENABLED else None
+        if self.memory and self.memory.turns:
+            print(f"🧠 Memory: {len(self.memory.turns)} past turn(s)")
+        
+        # Replies to repeated prompts
+        self.response_cache = ResponseCache() if RESPONSE_CACHE else None
+        
+        # Recording - preallocated buffer and endpointing stage
+        self.rec_buffer = np.zeros(SAMPLE_RATE * MAX_RECORD, dtype=np.float32)
+        self.audio = load_audio_profile()
+        self.vad = EnergyVAD(chunk=self.audio.chunk, silence_thresh=self.audio.silence_thresh)
+        self.live_stt = None
+        
+        if self.voice_mode:
+            # Speech-to-text loads in the background, the wake word path doesn't need it
+            self.stt = None
+            self.stt_error = None
+            self.stt_ready = threading.Event()
+            threading.Thread(target=self._load_stt, daemon=True).start()
+            
+            # Porcupine
+            self.porcupine = self._timed("porcupine", pvporcupine.create,
+                                         access_key=ACCESS_KEY, keyword_paths=[WAKE_WORD_PATH])
+            
+            # Speech - cached phrases play through PyAudio, everything else through pyttsx3
+            self.pa = pyaudio.PyAudio()
+            self.tts = SpeechWorker(
+                self.interrupt,
+                on_start=lambda: self._set_speaking(True),
+                on_finish=lambda: self._set_speaking(False),
+                pa=self.pa,
+                cache=TtsCache() if TTS_CACHE else None
+            )
+            self.tts.prerender(TTS_PRERENDER)
+            
+            # Audio - one stream, opened once and read only by the capture thread
+            self.ring = AudioRing(RING_SECONDS, self.porcupine.sample_rate)
+            self.stream = self._timed("audio", self.pa.open,
+                rate=self.porcupine.sample_rate,
+                channels=1,
+                format=pyaudio.paInt16,
+                input=True,
+                frames_per_buffer=self.porcupine.frame_length,
+                input_device_index=self._mic_index()
+            )
+            threading.Thread(target=self.capture_audio, daemon=True).start()
+        else:
+            self.porcupine = None
+            self.stt = None
+            self.stt_error = None
+            self.stt_ready = threading.Event()
+            self.pa = None
+            self.stream = None
+            self.ring = None
+            self.tts = None
+        
+        # Check AI availability
+        self._setup_ai(openai_probe, ollama_probe)
+        if self.router.healthy("openai"):
+            self.http.warm(OPENAI_URL)
+        if self.router.healthy("ollama"):
+            threading.Thread(target=self._prime_ollama, daemon=True).start()
+        self.router.start()
+        
+        self.startup_times["ready"] = time.perf_counter() - started
+        print(f"✅ Arthur ready ({'Voice' if self.voice_mode else 'Text'} Mode) - Using {self.ai_mode}!")
+        self._report_startup()
+        
+        # Start alarm/timer announcer
+        threading.Thread(target=self.announce_alarms_timers, daemon=True).start()
+        metrics.start_exporter()
+    
+    def new_session(self, session_id: str) -> "VoiceAssistant":
+        """A text-only view of this assistant for one server client: own history and timers,
+        shared backends, HTTP pool and caches. Long-term memory stays the console user's."""
+        session = copy.copy(self)
+        session.history = deque(maxlen=100)
+        session.scheduler = SessionScheduler(self.scheduler, session_id)
+        session.memory = None
+        session.last_prompt_stats = {}
+        session.reply_source = None
+        session.last_context_timings = {}
+        session.voice_mode, session.tts = False, None
+        return session
+    
+    def _timed(self, name: str, fn, *args, **kwargs):
+        """Run a startup step and record how long it took"""
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.startup_times[name] = time.perf_counter() - start
+    
+    def _report_startup(self):
+        """Print the startup timing report"""
+        steps = ", ".join(f"{name} {secs:.2f}s" for name, secs in self.startup_times.items() if name != "ready")
+        print(f"⏱️ Startup: {steps} | ready in {self.startup_times['ready']:.2f}s")
+    
+    def _mic_index(self) -> Optional[int]:
+        """The profiled mic. Indexes shift when devices come and go, so the name wins if they disagree"""
+        if not self.audio.mic_name:
+            return self.audio.mic_index
+        for i in range(self.pa.get_device_count()):
+            info = self.pa.get_device_info_by_index(i)
+            if info.get("maxInputChannels", 0) > 0 and info.get("name") == self.audio.mic_name:
+                if i != self.audio.mic_index:
+                    print(f"🎤 {self.audio.mic_name} moved to index {i}")
+                return i
+        print(f"⚠️ Profiled mic {self.audio.mic_name} not found, using index {self.audio.mic_index}")
+        return self.audio.mic_index
+    
+    def _load_stt(self):
+        """Background speech-to-text load, warm-up pass included"""
+        print(f"🔄 Loading Whisper ({STT_BACKEND} {STT_MODEL})...")
+        try:
+            self.stt = self._timed("whisper", load_stt)
+            self.stt_ready.set()
+            print(f"✅ Whisper loaded ({self.startup_times['whisper']:.2f}s)")
+        except Exception as e:
+            self.stt_error = e  # voice_turn reports it and retries instead of "warming up" forever
+            print(f"❌ Whisper load error: {e}")
+    
+    @property
+    def use_openai(self) -> bool:
+        return self.router.primary() == "openai"
+    
+    @property
+    def ai_mode(self) -> str:
+        if self.use_openai:
+            return "OpenAI GPT-4o-mini (Online)"
+        return "Ollama (Fallback)" if OPENAI_API_KEY else "Ollama (Offline)"
+    
+    def _setup_ai(self, openai_probe=None, ollama_probe=None):
+        """Check internet and AI availability. Backends that are down start with an open circuit,
+        the router keeps probing them and switches over once they answer (OpenAI preferred)"""
+        openai_ok = False
+        if OPENAI_API_KEY:
+            openai_ok = openai_probe.result() if openai_probe else self._check_openai()
+            if openai_ok:
+                print("✅ OpenAI: Connected")
+            else:
+                print("⚠️ OpenAI: Not available (no internet or invalid API key)")
+                self.router.trip("openai")
+        else:
+            print("⚠️ OpenAI: API key not set")
+        
+        ollama_ok = ollama_probe.result() if ollama_probe else self._check_ollama()
+        if ollama_ok:
+            print(f"✅ Ollama: {OLLAMA_MODEL}")
+        else:
+            self.router.trip("ollama")
+        
+        if not openai_ok and not ollama_ok:
+            print("❌ Error: Neither OpenAI nor Ollama available!")
+            print("   - For OpenAI: Set OPENAI_API_KEY environment variable and connect to internet")
+            print("   - For Ollama: Start with 'ollama serve'")
+            exit(1)
+    
+    def _check_openai(self) -> bool:
+        """Check if OpenAI API is accessible (lists models, which is free, instead of running a completion)"""
+        try:
+            headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"}
+            response = self.http.get("openai_check", OPENAI_MODELS_URL, headers=headers)
+            return response.status_code == 200
+        except:
+            return False
+    
+    def _check_ollama(self) -> bool:
+        """Check if Ollama is running"""
+        try:
+            ollama.list()
+            return True
+        except:
+            return False
+    
+    def capture_audio(self):
+        """Background mic capture - the only reader of the input stream"""
+        while self.running:
+            try:
+                data = self.stream.read(self.porcupine.frame_length, exception_on_overflow=False)
+                self.ring.write(np.frombuffer(data, dtype=np.int16))
+            except Exception as e:
+                if self.running:
+                    print(f"⚠️ Capture error: {e}")
+                    time.sleep(0.1)
+    
+    def monitor_wake_word(self):
+        """Background wake word detection"""
+        cursor = self.ring.written
+        while self.running:
+            try:
+                pcm, cursor = self.ring.read(cursor, self.porcupine.frame_length)
                 
-                result = "Weekend forecast for Noels Pond: "
+                if self.porcupine.process(pcm.tolist()) >= 0:
+                    if self.recording:
+                        continue
+                    if self.speaking:
+                        self.interrupt.set()  # Playback stops within a chunk, before the loop even sees it
+                        print("\n⚠️ INTERRUPT!")
+                    else:
+                        print("\n🟢 Wake word!")
+                    self.loop.call_soon_threadsafe(self.wake_events.put_nowait, cursor)
+            except Exception as e:
+                print(f"⚠️ {e}")
+    
+    def announce_alarms_timers(self):
+        """Background announcer for alarms/timers fired by the scheduler"""
+        while True:
+            try:
+                kind, _, label = self.scheduler.fired.get()
                 
-                if saturday_data:
-                    sat_temp = saturday_data['main']['temp']
-                    sat_desc = saturday_data['weather'][0]['description']
-                    result += f"Saturday: {sat_temp:.0f}°C, {sat_desc}. "
+                session_id, _, kind = kind.rpartition("/")
+                if session_id:  # A server session's timer, the client fetches it
+                    if self.server:
+                        self.server.notify(session_id, kind, label)
+                    continue
                 
-                if sunday_data:
-                    sun_temp = sunday_data['main']['temp']
-                    sun_desc = sunday_data['weather'][0]['description']
-                    result += f"Sunday: {sun_temp:.0f}°C, {sun_desc}."
+                if kind == "alarm":
+                    msg = f"⏰ ALARM! {label}" if label else "⏰ ALARM!"
+                else:
+                    msg = f"⏱️ TIMER DONE! {label}" if label else "⏱️ TIMER DONE!"
+                print(f"\n{msg}")
+                self.play_alarm_sound()
+                self.speak(msg)
+            except Exception as e:
+                print(f"⚠️ Alarm announcer error: {e}")
+    
+    def word_to_number(self, text: str) -> str:
+        """Convert word numbers to digits"""
+        return word_to_number(text)
+    
+    def parse_time(self, text: str) -> Optional[datetime]:
+        """Parse time expressions"""
+        text = self.word_to_number(text.strip()).upper()
+        
+        match = TIME_HM_PERIOD_RE.search(text)
+        if match:
+            hour, minute, period = match.groups()
+            hour = int(hour)
+            minute = int(minute)
+            
+            if period == 'PM' and hour != 12:
+                hour += 12
+            elif period == 'AM' and hour == 12:
+                hour = 0
+            
+            target = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if target <= datetime.now():
+                target += timedelta(days=1)
+            return target
+        
+        match = TIME_H_PERIOD_RE.search(text)
+        if match:
+            hour, period = match.groups()
+            hour = int(hour)
+            
+            if period == 'PM' and hour != 12:
+                hour += 12
+            elif period == 'AM' and hour == 12:
+                hour = 0
+            
+            target = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
+            if target <= datetime.now():
+                target += timedelta(days=1)
+            return target
+        
+        match = TIME_HM_RE.search(text)
+        if match:
+            hour, minute = match.groups()
+            hour = int(hour)
+            minute = int(minute)
+            
+            target = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if target <= datetime.now():
+                target += timedelta(days=1)
+            return target
+        
+        return None
+    
+    def parse_duration(self, text: str) -> Optional[int]:
+        """Parse duration in seconds"""
+        text = self.word_to_number(text.lower())
+        total_seconds = 0
+        
+        for pattern, unit in DURATION_RES:
+            match = pattern.search(text)
+            if match:
+                total_seconds += int(match.group(1)) * unit
+        
+        return total_seconds if total_seconds > 0 else None
+    
+    def play_alarm_sound(self):
+        """Play alarm sound"""
+        try:
+            import winsound
+            for _ in range(3):
+                winsound.Beep(1000, 500)
+                time.sleep(0.2)
+        except:
+            for _ in range(3):
+                print('\a', end='', flush=True)
+                time.sleep(0.5)
+    
+    def _fetch_owm(self, endpoint: str) -> dict:
+        """Fetch one OpenWeatherMap endpoint (weather / forecast), raises on failure"""
+        url = f"http://api.openweathermap.org/data/2.5/{endpoint}?q={WEATHER_LOCATION}&appid={WEATHER_API_KEY}&units=metric"
+        response = self.http.get("weather", url)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return response.json()
+    
+    def _age_note(self, name: str, age: float) -> str:
+        """' (as of N min ago)' when a cached response is past its TTL"""
+        _, ttl = self.weather_cache.sources[name]
+        return f" (as of {age / 60:.0f} min ago)" if age > ttl else ""
+    
+    def get_weather(self, wait: float = 0.0) -> str:
+        """Get current weather information (from cache, empty if nothing fetched yet)"""
+        if not WEATHER_API_KEY:
+            return "Weather API key not set. Get a free key at openweathermap.org and set OPENWEATHER_API_KEY environment variable."
+        
+        data, age = self.weather_cache.get("weather", wait)
+        if data is None:
+            return ""
+        
+        try:
+            temp = data['main']['temp']
+            feels = data['main']['feels_like']
+            desc = data['weather'][0]['description']
+            humidity = data['main']['humidity']
+            
+            return f"It's {temp:.0f}°C in Noels Pond, feels like {feels:.0f}°C. {desc.capitalize()}. Humidity {humidity}%.{self._age_note('weather', age)}"
+        except Exception as e:
+            return f"Weather check failed: {str(e)}"
+    
+    def get_forecast(self, wait: float = 0.0) -> str:
+        """Get weekend/multi-day weather forecast (from cache, empty if nothing fetched yet)"""
+        if not WEATHER_API_KEY:
+            return "Weather API key not set."
+        
+        data, age = self.weather_cache.get("forecast", wait)
+        if data is None:
+            return ""
+        
+        try:
+            # Get today's day number (0=Monday, 6=Sunday)
+            today = datetime.now().weekday()
+            
+            # Calculate days until Saturday (5) and Sunday (6)
+            days_to_saturday = (5 - today) % 7
+            days_to_sunday = (6 - today) % 7
+            
+            # If it's already Saturday or Sunday, use today/tomorrow
+            if today == 5:  # Saturday
+                days_to_saturday = 0
+                days_to_sunday = 1
+            elif today == 6:  # Sunday
+                days_to_saturday = 6
+                days_to_sunday = 0
+            
+            saturday = datetime.now() + timedelta(days=days_to_saturday)
+            sunday = datetime.now() + timedelta(days=days_to_sunday)
+            
+            # Find forecasts for Saturday and Sunday (around noon)
+            saturday_data = None
+            sunday_data = None
+            
+            for forecast in data['list']:
+                forecast_time = datetime.fromtimestamp(forecast['dt'])
                 
-                if not saturday_data and not sunday_data:
-                    return "Weekend forecast not available yet (only shows next 5 days)."
+                # Look for forecast around noon (12:00)
+                if forecast_time.date() == saturday.date() and 10 <= forecast_time.hour <= 14:
+                    if not saturday_data:
+                        saturday_data = forecast
+                    else:
+                        # Pick the one closest to noon
+                        current_diff = abs(forecast_time.hour - 12)
+                        prev_time = datetime.fromtimestamp(saturday_data['dt'])
+                        prev_diff = abs(prev_time.hour - 12)
+                        if current_diff < prev_diff:
+                            saturday_data = forecast
                 
-                return result.strip()
-            else:
-                return "Couldn't fetch forecast. Check your API key or internet connection."
+                if forecast_time.date() == sunday.date() and 10 <= forecast_time.hour <= 14:
+                    if not sunday_data:
+                        sunday_data = forecast
+                    else:
+                        # Pick the one closest to noon
+                        current_diff = abs(forecast_time.hour - 12)
+                        prev_time = datetime.fromtimestamp(sunday_data['dt'])
+                        prev_diff = abs(prev_time.hour - 12)
+                        if current_diff < prev_diff:
+                            sunday_data = forecast
+            
+            result = "Weekend forecast for Noels Pond: "
+            
+            if saturday_data:
+                sat_temp = saturday_data['main']['temp']
+                sat_desc = saturday_data['weather'][0]['description']
+                result += f"Saturday: {sat_temp:.0f}°C, {sat_desc}. "
+            
+            if sunday_data:
+                sun_temp = sunday_data['main']['temp']
+                sun_desc = sunday_data['weather'][0]['description']
+                result += f"Sunday: {sun_temp:.0f}°C, {sun_desc}."
+            
+            if not saturday_data and not sunday_data:
+                return "Weekend forecast not available yet (only shows next 5 days)."
+            
+            return result.strip() + self._age_note('forecast', age)
         except Exception as e:
             return f"Forecast check failed: {str(e)}"
     
-    def handle_command(self, text: str) -> Optional[str]:
-        """Handle special commands - REMOVED time/date queries to let AI handle them naturally"""
-        lower = text.lower()
+    def handle_command(self, text: str) -> Optional[str]:
+        """Handle special commands - REMOVED time/date queries to let AI handle them naturally"""
+        # Weather/Forecast - Don't return directly, return None to let AI handle it
+        # The data will be injected into the prompt instead
+        with metrics.span("route"):
+            intent = route(text)
+        if intent is None:
+            return None
+        return getattr(self, f"_cmd_{intent.name}")(intent)
+    
+    def _cmd_clear_history(self, intent: Intent) -> str:
+        count = len(self.history)
+        self.history.clear()
+        if self.memory:
+            count = max(count, self.memory.clear())
+        return f"Memory cleared! Forgot {count} conversation(s)." if count > 0 else "Memory was already empty."
+    
+    def _cmd_set_alarm(self, intent: Intent) -> str:
+        alarm_time = self.parse_time(intent.text)
+        if not alarm_time:
+            return "Couldn't parse that time. Try like '7:30 AM' or '3 PM'"
+        
+        label = ""
+        if 'for' in intent.keywords:
+            parts = intent.lower.split('for', 1)
+            if len(parts) > 1:
+                label_part = parts[1].strip().replace('alarm', '').strip()
+                label_part = ALARM_LABEL_RE.sub('', label_part)
+                label_part = re.sub(r'[\d:]+', '', label_part)
+                label = label_part.strip().strip(',').strip()
+        
+        self.scheduler.add(alarm_time, "alarm", label)
+        
+        time_str = alarm_time.strftime("%I:%M %p")
+        if label:
+            return f"Alarm set for {time_str} - {label}"
+        return f"Alarm set for {time_str}"
+    
+    def _cmd_list_alarms(self, intent: Intent) -> str:
+        alarms = self.scheduler.pending("alarm")
+        if not alarms:
+            return "No alarms set"
+        
+        msg = f"You have {len(alarms)} alarm(s): "
+        alarm_list = []
+        for alarm_time, label, _ in alarms:
+            time_str = alarm_time.strftime("%I:%M %p")
+            if label:
+                alarm_list.append(f"{time_str} ({label})")
+            else:
+                alarm_list.append(time_str)
+        return msg + ", ".join(alarm_list)
+    
+    def _cmd_clear_alarms(self, intent: Intent) -> str:
+        alarm_time = self.parse_time(intent.text)
+        if alarm_time and 'all' not in intent.keywords:
+            for atime, label, alarm_id in self.scheduler.pending("alarm"):
+                if atime.hour == alarm_time.hour and atime.minute == alarm_time.minute:
+                    self.scheduler.cancel(alarm_id)
+                    time_str = atime.strftime("%I:%M %p")
+                    return f"Cancelled alarm at {time_str}"
+            return "No alarm found at that time"
         
-        # Reset/Clear history
-        if any(phrase in lower for phrase in ['reset history', 'clear history', 'forget everything', 'clear memory', 'reset memory']):
-            count = len(self.history)
-            self.history.clear()
-            return f"Memory cleared! Forgot {count} conversation(s)." if count > 0 else "Memory was already empty."
+        count = self.scheduler.clear("alarm")
+        return f"Cleared {count} alarm(s)" if count > 0 else "No alarms to clear"
+    
+    def _cmd_set_timer(self, intent: Intent) -> str:
+        duration = self.parse_duration(intent.text)
+        if not duration:
+            return "Couldn't parse that duration. Try like '5 minutes' or '2 hours 30 minutes'"
         
-        # Weather/Forecast - Don't return directly, return None to let AI handle it
-        # The data will be injected into the prompt instead
+        label = ""
+        if 'for' in intent.keywords:
+            parts = intent.lower.split('for')
+            if len(parts) > 1:
+                label_part = TIMER_LABEL_RE.sub('', parts[-1])
+                label_part = re.sub(r'\b\d+\b', '', label_part)
+                label = label_part.strip().strip(',').strip()
         
-        # Set alarm
-        if 'alarm' in lower and ('set' in lower or 'create' in lower or 'for' in lower or 'at' in lower):
-            alarm_time = self.parse_time(text)
-            if alarm_time:
-                label = ""
-                if 'for' in lower:
-                    parts = lower.split('for', 1)
-                    if len(parts) > 1:
-                        label_part = parts[1].strip().replace('alarm', '').strip()
-                        time_words = ['am', 'pm', 'o\'clock', 'oclock']
-                        number_words = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
-                                      'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 
-                                      'eighteen', 'nineteen', 'twenty', 'thirty', 'forty', 'fifty', 'sixty',
-                                      'twenty-one', 'twenty-two', 'twenty-three', 'twenty-four', 'twenty-five',
-                                      'twenty-six', 'twenty-seven', 'twenty-eight', 'twenty-nine', 'a', 'an']
-                        for word in time_words + number_words:
-                            label_part = re.sub(r'\b' + word + r'\b', '', label_part, flags=re.IGNORECASE)
-                        label_part = re.sub(r'[\d:]+', '', label_part)
-                        label = label_part.strip().strip(',').strip()
-                
-                with self.alarm_lock:
-                    self.alarms.append((alarm_time, label))
-                
-                time_str = alarm_time.strftime("%I:%M %p")
-                if label:
-                    return f"Alarm set for {time_str} - {label}"
-                return f"Alarm set for {time_str}"
-            else:
-                return "Couldn't parse that time. Try like '7:30 AM' or '3 PM'"
+        end_time = datetime.now() + timedelta(seconds=duration)
+        self.scheduler.add(end_time, "timer", label)
         
-        # List alarms
-        if 'alarm' in lower and ('list' in lower or 'show' in lower or 'what' in lower):
-            with self.alarm_lock:
-                if not self.alarms:
-                    return "No alarms set"
-                
-                msg = f"You have {len(self.alarms)} alarm(s): "
-                alarm_list = []
-                for alarm_time, label in sorted(self.alarms):
-                    time_str = alarm_time.strftime("%I:%M %p")
-                    if label:
-                        alarm_list.append(f"{time_str} ({label})")
-                    else:
-                        alarm_list.append(time_str)
-                return msg + ", ".join(alarm_list)
-        
-        # Clear alarms
-        if 'alarm' in lower and ('clear' in lower or 'delete' in lower or 'remove' in lower or 'cancel' in lower):
-            alarm_time = self.parse_time(text)
-            if alarm_time and 'all' not in lower:
-                with self.alarm_lock:
-                    for i, (atime, label) in enumerate(self.alarms):
-                        if atime.hour == alarm_time.hour and atime.minute == alarm_time.minute:
-                            self.alarms.pop(i)
-                            time_str = atime.strftime("%I:%M %p")
-                            return f"Cancelled alarm at {time_str}"
-                    return "No alarm found at that time"
-            
-            with self.alarm_lock:
-                count = len(self.alarms)
-                self.alarms.clear()
-                return f"Cleared {count} alarm(s)" if count > 0 else "No alarms to clear"
-        
-        # Set timer
-        if 'timer' in lower and ('set' in lower or 'create' in lower or 'for' in lower or 'start' in lower):
-            duration = self.parse_duration(text)
-            if duration:
-                label = ""
-                if 'for' in lower:
-                    parts = text.lower().split('for')
-                    if len(parts) > 1:
-                        label_part = parts[-1]
-                        time_words = ['minutes', 'minute', 'min', 'hours', 'hour', 'hr', 'seconds', 'second', 'sec', 'timer']
-                        number_words = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
-                                      'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 
-                                      'eighteen', 'nineteen', 'twenty', 'thirty', 'forty', 'fifty', 'sixty',
-                                      'twenty-one', 'twenty-two', 'twenty-three', 'twenty-four', 'twenty-five',
-                                      'twenty-six', 'twenty-seven', 'twenty-eight', 'twenty-nine', 'a', 'an']
-                        for word in time_words + number_words:
-                            label_part = re.sub(r'\b' + word + r'\b', '', label_part, flags=re.IGNORECASE)
-                        label_part = re.sub(r'\b\d+\b', '', label_part)
-                        label = label_part.strip().strip(',').strip()
-                
-                end_time = datetime.now() + timedelta(seconds=duration)
-                
-                with self.alarm_lock:
-                    self.timers.append((end_time, label))
-                
-                hours = duration // 3600
-                minutes = (duration % 3600) // 60
-                seconds = duration % 60
-                
-                time_parts = []
-                if hours > 0:
-                    time_parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
-                if minutes > 0:
-                    time_parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
-                if seconds > 0:
-                    time_parts.append(f"{seconds} second{'s' if seconds != 1 else ''}")
-                
-                duration_str = " ".join(time_parts)
-                
-                if label:
-                    return f"Timer set for {duration_str} - {label}"
-                return f"Timer set for {duration_str}"
-            else:
-                return "Couldn't parse that duration. Try like '5 minutes' or '2 hours 30 minutes'"
+        hours = duration // 3600
+        minutes = (duration % 3600) // 60
+        seconds = duration % 60
         
-        # List timers
-        if 'timer' in lower and ('list' in lower or 'show' in lower or 'what' in lower or 'check' in lower):
-            with self.alarm_lock:
-                if not self.timers:
-                    return "No timers running"
-                
-                msg = f"You have {len(self.timers)} timer(s): "
-                timer_list = []
-                for end_time, label in sorted(self.timers):
-                    remaining = (end_time - datetime.now()).total_seconds()
-                    if remaining > 0:
-                        mins = int(remaining // 60)
-                        secs = int(remaining % 60)
-                        time_str = f"{mins}m {secs}s"
-                        if label:
-                            timer_list.append(f"{time_str} ({label})")
-                        else:
-                            timer_list.append(time_str)
-                return msg + ", ".join(timer_list)
-        
-        # Clear timers
-        if 'timer' in lower and ('clear' in lower or 'delete' in lower or 'remove' in lower or 'cancel' in lower or 'stop' in lower):
-            match = re.search(r'(?:timer\s*)?(?:number\s*)?(\d+|first|second|third|last)', lower)
-            if match and 'all' not in lower:
-                position_str = match.group(1)
-                
-                position_map = {'first': 0, 'second': 1, 'third': 2, 'last': -1}
-                if position_str in position_map:
-                    index = position_map[position_str]
-                else:
-                    index = int(position_str) - 1
-                
-                with self.alarm_lock:
-                    if not self.timers:
-                        return "No timers to cancel"
-                    
-                    sorted_timers = sorted(self.timers)
-                    
-                    if index < 0:
-                        index = len(sorted_timers) + index
-                    
-                    if 0 <= index < len(sorted_timers):
-                        timer_to_remove = sorted_timers[index]
-                        self.timers.remove(timer_to_remove)
-                        
-                        remaining = (timer_to_remove[0] - datetime.now()).total_seconds()
-                        mins = int(remaining // 60)
-                        secs = int(remaining % 60)
-                        
-                        if timer_to_remove[1]:
-                            return f"Cancelled timer: {timer_to_remove[1]} ({mins}m {secs}s remaining)"
-                        return f"Cancelled timer with {mins}m {secs}s remaining"
-                    else:
-                        return f"Timer number {index + 1} doesn't exist"
-            
-            with self.alarm_lock:
-                count = len(self.timers)
-                self.timers.clear()
-                return f"Cleared {count} timer(s)" if count > 0 else "No timers to clear"
+        time_parts = []
+        if hours > 0:
+            time_parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
+        if minutes > 0:
+            time_parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
+        if seconds > 0:
+            time_parts.append(f"{seconds} second{'s' if seconds != 1 else ''}")
         
-        return None
+        duration_str = " ".join(time_parts)
+        
+        if label:
+            return f"Timer set for {duration_str} - {label}"
+        return f"Timer set for {duration_str}"
     
-    def record(self) -> Optional[str]:
-        """Record audio until silence"""
-        print("🎤 Listening...")
-        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    def _cmd_list_timers(self, intent: Intent) -> str:
+        timers = self.scheduler.pending("timer")
+        if not timers:
+            return "No timers running"
         
-        try:
-            with self.audio_lock:
-                self.stream.stop_stream()
+        msg = f"You have {len(timers)} timer(s): "
+        timer_list = []
+        for end_time, label, _ in timers:
+            remaining = (end_time - datetime.now()).total_seconds()
+            if remaining > 0:
+                mins = int(remaining // 60)
+                secs = int(remaining % 60)
+                time_str = f"{mins}m {secs}s"
+                if label:
+                    timer_list.append(f"{time_str} ({label})")
+                else:
+                    timer_list.append(time_str)
+        return msg + ", ".join(timer_list)
+    
+    def _cmd_clear_timers(self, intent: Intent) -> str:
+        match = TIMER_POSITION_RE.search(intent.lower)
+        if match and 'all' not in intent.keywords:
+            position_str = match.group(1)
             
-            rec_stream = self.pa.open(
-                format=pyaudio.paInt16, channels=1, rate=SAMPLE_RATE,
-                input=True, frames_per_buffer=CHUNK, input_device_index=MIC_INDEX
-            )
+            position_map = {'first': 0, 'second': 1, 'third': 2, 'last': -1}
+            if position_str in position_map:
+                index = position_map[position_str]
+            else:
+                index = int(position_str) - 1
             
-            for _ in range(5):
-                rec_stream.read(CHUNK, exception_on_overflow=False)
-            time.sleep(0.2)
+            sorted_timers = self.scheduler.pending("timer")
+            if not sorted_timers:
+                return "No timers to cancel"
             
-            frames, silence_cnt, speech_cnt = [], 0, 0
-            max_silence = int(SILENCE_TIME * SAMPLE_RATE / CHUNK)
-            min_speech = int(MIN_SPEECH * SAMPLE_RATE / CHUNK)
-            speaking = False
+            if index < 0:
+                index = len(sorted_timers) + index
             
-            for _ in range(int(SAMPLE_RATE / CHUNK * 30)):
-                data = rec_stream.read(CHUNK, exception_on_overflow=False)
-                frames.append(data)
-                
-                rms = np.sqrt(np.mean(np.square(np.frombuffer(data, dtype=np.int16).astype(np.float32))))
+            if 0 <= index < len(sorted_timers):
+                end_time, label, timer_id = sorted_timers[index]
+                if not self.scheduler.cancel(timer_id):
+                    return "That timer just went off"
                 
-                if rms > SILENCE_THRESH:
-                    speech_cnt += 1
-                    silence_cnt = 0
-                    if not speaking and speech_cnt >= 2:
-                        speaking = True
-                        print("   🗣️ Speaking...")
-                else:
-                    silence_cnt += 1
+                remaining = (end_time - datetime.now()).total_seconds()
+                mins = int(remaining // 60)
+                secs = int(remaining % 60)
                 
-                if speaking and speech_cnt >= min_speech and silence_cnt > max_silence:
-                    print("   ⏹️ Done")
-                    break
-            
-            rec_stream.stop_stream()
-            rec_stream.close()
+                if label:
+                    return f"Cancelled timer: {label} ({mins}m {secs}s remaining)"
+                return f"Cancelled timer with {mins}m {secs}s remaining"
+            else:
+                return f"Timer number {index + 1} doesn't exist"
+        
+        count = self.scheduler.clear("timer")
+        return f"Cleared {count} timer(s)" if count > 0 else "No timers to clear"
+    
+    def record(self, wake_pos: Optional[int] = None) -> Optional[np.ndarray]:
+        """Record audio until silence (float32 samples at SAMPLE_RATE, ready for Whisper)
+        
+        Reads from the shared capture ring, starting PRE_ROLL seconds before wake_pos
+        (the ring position where the wake word ended) so nothing said right after it is lost."""
+        print("🎤 Listening...")
+        self.recording = True
+        
+        try:
+            if wake_pos is None:
+                cursor = self.ring.written
+            else:
+                cursor = max(wake_pos - int(PRE_ROLL * SAMPLE_RATE), self.ring.written - self.ring.size)
             
-            with self.audio_lock:
-                self.stream.start_stream()
+            def chunks():
+                nonlocal cursor
+                while True:
+                    pcm, cursor = self.ring.read(cursor, self.audio.chunk, timeout=1.0)
+                    if pcm is None:
+                        raise RuntimeError("no audio from capture thread")
+                    yield pcm
             
-            if frames and len(frames) >= min_speech:
-                with wave.open(tmp.name, "wb") as wf:
-                    wf.setnchannels(1)
-                    wf.setsampwidth(self.pa.get_sample_size(pyaudio.paInt16))
-                    wf.setframerate(SAMPLE_RATE)
-                    wf.writeframes(b"".join(frames))
-                
-                if os.path.getsize(tmp.name) > 1000:
-                    return tmp.name
+            audio = self.capture_utterance(chunks())
+            if audio is not None and DEBUG_SAVE_WAV:
+                self.save_wav(audio)
+            return audio
         except Exception as e:
             print(f"❌ Record error: {e}")
-            with self.audio_lock:
-                self.stream.start_stream()
+        finally:
+            self.recording = False
+        
+        return None
+    
+    def record_wav(self, path: str) -> Optional[np.ndarray]:
+        """Record from a WAV fixture instead of the mic (test mode)"""
+        return self.capture_utterance(wav_chunks(path, self.audio.chunk))
+    
+    def capture_utterance(self, chunks) -> Optional[np.ndarray]:
+        """Run int16 chunks through the VAD into the record buffer until the turn ends"""
+        self.vad.reset()
+        n = 0
+        
+        for pcm in chunks:
+            if n + len(pcm) > len(self.rec_buffer):
+                break
+            self.rec_buffer[n:n + len(pcm)] = pcm / 32768.0
+            n += len(pcm)
+            if self.live_stt:
+                self.live_stt.feed(n)
+            
+            if self.vad.update(pcm):
+                metrics.observe("endpoint", self.vad.endpoint_latency)
+                print(f"   ⏹️ Done (endpoint {self.vad.endpoint_latency:.2f}s after speech)")
+                break
         
+        if n >= max(int(MIN_SPEECH * SAMPLE_RATE), self.audio.chunk):
+            return self.rec_buffer[:n].copy()
         return None
     
-    def transcribe(self, file: str) -> Optional[str]:
-        """Convert speech to text"""
-        if not file or not Path(file).exists():
+    def save_wav(self, audio: np.ndarray):
+        """Dump a recording to DEBUG_WAV_DIR (debugging only)"""
+        try:
+            Path(DEBUG_WAV_DIR).mkdir(exist_ok=True)
+            path = Path(DEBUG_WAV_DIR) / f"utterance_{datetime.now():%Y%m%d_%H%M%S_%f}.wav"
+            with wave.open(str(path), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(SAMPLE_RATE)
+                wf.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+            print(f"   💾 Saved {path}")
+        except Exception as e:
+            print(f"⚠️ Could not save WAV: {e}")
+    
+    def listen(self, wake_pos: Optional[int] = None):
+        """Record an utterance and transcribe it, returns (audio, text)
+        
+        With STREAMING_STT the transcript is built while the user is still talking, so only
+        the last bit of audio is left to decode at the endpoint."""
+        live = None
+        if STREAMING_STT and self.stt is not None:
+            live = self.live_stt = StreamingTranscriber(self._decode, self.rec_buffer)
+        
+        try:
+            with metrics.span("record"):
+                audio = self.record(wake_pos)
+        finally:
+            self.live_stt = None
+        
+        if audio is None:
+            if live:
+                live.cancel()
+            return None, None
+        if live is None:
+            return audio, self.transcribe(audio)
+        
+        try:
+            with metrics.span("transcribe"):
+                return audio, self._clean_transcript(live.finish(len(audio)))
+        except Exception as e:
+            print(f"❌ Transcribe error: {e}")
+            return audio, None
+    
+    def _decode(self, audio: np.ndarray, prompt: str = "", word_timestamps: bool = False) -> dict:
+        """One Whisper pass over float32 audio"""
+        return self.stt.decode(audio, prompt, word_timestamps)
+    
+    def _clean_transcript(self, text: str) -> Optional[str]:
+        text = text.strip().replace("[BLANK_AUDIO]", "").strip()
+        return text if text and len(text) > 2 else None
+    
+    def transcribe(self, audio: Optional[np.ndarray]) -> Optional[str]:
+        """Convert speech to text (audio goes straight to Whisper, no file or ffmpeg)"""
+        if audio is None or not len(audio) or self.stt is None:
             return None
         
         try:
-            result = self.whisper.transcribe(file, language="en", fp16=False, temperature=0.0)
-            text = result["text"].strip().replace("[BLANK_AUDIO]", "").strip()
-            if text and len(text) > 2:
-                return text
+            with metrics.span("transcribe"):
+                result = self._decode(audio)
+            return self._clean_transcript(result["text"])
         except Exception as e:
             print(f"❌ Transcribe error: {e}")
         return None
     
-    def ask_openai(self, prompt: str) -> str:
-        """Get response from OpenAI"""
-        try:
-            current_time = datetime.now().strftime("%A, %B %d, %Y at %I:%M %p")
-            
-            # Check if user is asking about weather and inject data
-            weather_data = ""
-            lower_prompt = prompt.lower()
-            
-            if any(word in lower_prompt for word in ['weekend', 'forecast', 'saturday', 'sunday', 'this week', 'next week']):
-                forecast = self.get_forecast()
-                if forecast and not forecast.startswith("Forecast check failed"):
-                    weather_data = f"\n\nCurrent Weather Forecast:\n{forecast}"
-            elif any(word in lower_prompt for word in ['weather', 'temperature', 'outside', 'hot', 'cold', 'rain', 'snow']):
-                weather = self.get_weather()
-                if weather and not weather.startswith("Weather check failed"):
-                    weather_data = f"\n\nCurrent Weather:\n{weather}"
-            
-            msgs = [{
-                "role": "system",
-                "content": f"You are Arthur, Ronan's AI. Be casual, witty, concise (1-2 sentences).\n\n{USER_INFO.format(current_time=current_time)}{weather_data}"
-            }]
-            
-            for entry in list(self.history)[-3:]:
-                msgs.append({"role": "user", "content": entry["user"]})
-                msgs.append({"role": "assistant", "content": entry["assistant"]})
-            
-            msgs.append({"role": "user", "content": prompt})
-            
-            headers = {
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": OPENAI_MODEL,
-                "messages": msgs,
-                "max_tokens": MAX_TOKENS,
-                "temperature": TEMP
-            }
-            
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                reply = response.json()['choices'][0]['message']['content'].strip()
-                self.history.append({"user": prompt, "assistant": reply})
-                return reply
-            else:
-                print(f"❌ OpenAI error: {response.status_code}")
-                if self._check_ollama():
-                    print("   ⚠️ Falling back to Ollama...")
-                    self.use_openai = False
-                    self.ai_mode = "Ollama (Fallback)"
-                    return self.ask_ollama(prompt)
-                return "OpenAI request failed. Check your connection or API key."
+    def _build_messages(self, prompt: str) -> list:
+        """Build the chat messages: static persona first, then past turns, then the turn's context and the prompt.
+        The context providers run concurrently, anything that misses its deadline is left out"""
+        context, self.last_context_timings = self.context.gather(self, prompt)
+        
+        msgs = [{"role": "system", "content": SYSTEM_PROMPT}]
+        
+        turns = context.pop("memory", None)
+        if turns is None:  # Memory search missed its deadline, the latest turns will do
+            turns = self._recent_turns()
+        for user, assistant in turns:
+            msgs.append({"role": "user", "content": user})
+            msgs.append({"role": "assistant", "content": assistant})
+        
+        extra = "".join(context.values()).strip()
+        if extra:
+            msgs.append({"role": "system", "content": extra})
+        msgs.append({"role": "user", "content": prompt})
+        return msgs
+    
+    def _recent_turns(self) -> list:
+        return [(entry["user"], entry["assistant"]) for entry in list(self.history)[-MEMORY_RECENT:]]
+    
+    def _time_context(self, prompt: str) -> str:
+        return f"Current Date/Time: {datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}"
+    
+    def _memory_context(self, prompt: str) -> list:
+        """Past turns for the prompt: relevant ones from long-term memory, or just the latest"""
+        return self.memory.pack(prompt) if self.memory else self._recent_turns()
+    
+    def _alarms_context(self, prompt: str) -> str:
+        """Pending alarms and timers, so questions like "how long until the pizza's done" can be answered"""
+        now = datetime.now()
+        alarms = [f"{due.strftime('%I:%M %p')}{f' ({label})' if label else ''}"
+                  for due, label, _ in self.scheduler.pending("alarm")]
+        timers = [f"{int(left // 60)}m {int(left % 60)}s left{f' ({label})' if label else ''}"
+                  for due, label, _ in self.scheduler.pending("timer") if (left := (due - now).total_seconds()) > 0]
+        
+        text = ""
+        if alarms:
+            text += f"\n\nAlarms set: {', '.join(alarms)}"
+        if timers:
+            text += f"\n\nTimers running: {', '.join(timers)}"
+        return text
+    
+    def _prompt_metrics(self, response: dict):
+        """Record how much of the prompt the backend had to evaluate vs. reused from its cache"""
+        stats = {}
+        usage = response.get("usage")
+        if usage:  # OpenAI
+            stats["prompt_tokens"] = usage.get("prompt_tokens", 0)
+            stats["cached_tokens"] = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+            metrics.inc("prompt_tokens", stats["prompt_tokens"])
+            metrics.inc("cached_prompt_tokens", stats["cached_tokens"])
+        elif response.get("prompt_eval_count") is not None:  # Ollama (cached tokens aren't evaluated or counted)
+            stats["prompt_eval_tokens"] = response.get("prompt_eval_count")
+            stats["prompt_eval_seconds"] = (response.get("prompt_eval_duration") or 0) / 1e9
+            metrics.inc("prompt_eval_tokens", stats["prompt_eval_tokens"])
+            metrics.observe("prompt_eval", stats["prompt_eval_seconds"])
+        self.last_prompt_stats = stats
+    
+    def _prime_ollama(self):
+        """Evaluate the static system prompt once so the first turn already hits Ollama's prompt cache"""
+        try:
+            ollama.chat(model=OLLAMA_MODEL, messages=[{"role": "system", "content": SYSTEM_PROMPT}],
+                        options={**self.ollama_options, "num_predict": 1}, keep_alive=OLLAMA_KEEP_ALIVE)
         except Exception as e:
-            print(f"❌ OpenAI error: {e}")
-            if self._check_ollama():
-                print("   ⚠️ Falling back to Ollama...")
-                self.use_openai = False
-                self.ai_mode = "Ollama (Fallback)"
-                return self.ask_ollama(prompt)
-            return "Something went wrong with OpenAI."
-    
-    def ask_ollama(self, prompt: str) -> str:
-        """Get response from Ollama"""
-        try:
-            current_time = datetime.now().strftime("%A, %B %d, %Y at %I:%M %p")
-            
-            # Check if user is asking about weather and inject data
-            weather_data = ""
-            lower_prompt = prompt.lower()
-            
-            if any(word in lower_prompt for word in ['weekend', 'forecast', 'saturday', 'sunday', 'this week', 'next week']):
-                forecast = self.get_forecast()
-                if forecast and not forecast.startswith("Forecast check failed"):
-                    weather_data = f"\n\nCurrent Weather Forecast:\n{forecast}"
-            elif any(word in lower_prompt for word in ['weather', 'temperature', 'outside', 'hot', 'cold', 'rain', 'snow']):
-                weather = self.get_weather()
-                if weather and not weather.startswith("Weather check failed"):
-                    weather_data = f"\n\nCurrent Weather:\n{weather}"
-            
-            msgs = [{
-                "role": "system",
-                "content": f"You are Arthur, Ronan's AI. Be casual, witty, concise (1-2 sentences).\n\n{USER_INFO.format(current_time=current_time)}{weather_data}"
-            }]
-            
-            for entry in list(self.history)[-3:]:
-                msgs.append({"role": "user", "content": entry["user"]})
-                msgs.append({"role": "assistant", "content": entry["assistant"]})
-            
-            msgs.append({"role": "user", "content": prompt})
-            
-            response = ollama.chat(
-                model=OLLAMA_MODEL,
-                messages=msgs,
-                options={"temperature": TEMP, "num_predict": MAX_TOKENS, "num_ctx": 2048}
-            )
+            print(f"⚠️ Ollama warm-up failed: {e}")
+    
+    def _weather_context(self, prompt: str) -> str:
+        """Weather or forecast text for the prompt if the user is asking about it"""
+        return self._forecast_context(prompt) or self._current_weather_context(prompt)
+    
+    def _forecast_context(self, prompt: str) -> str:
+        lower_prompt = prompt.lower()
+        if any(word in lower_prompt for word in FORECAST_WORDS):
+            forecast = self.get_forecast(wait=WEATHER_FIRST_WAIT)
+            if forecast and not forecast.startswith("Forecast check failed"):
+                return f"\n\nCurrent Weather Forecast:\n{forecast}"
+        return ""
+    
+    def _current_weather_context(self, prompt: str) -> str:
+        lower_prompt = prompt.lower()
+        if any(word in lower_prompt for word in WEATHER_WORDS) and not any(word in lower_prompt for word in FORECAST_WORDS):
+            weather = self.get_weather(wait=WEATHER_FIRST_WAIT)
+            if weather and not weather.startswith("Weather check failed"):
+                return f"\n\nCurrent Weather:\n{weather}"
+        return ""
+    
+    def _remember(self, prompt: str, reply: str):
+        """Add a finished turn to this session's history and the long-term memory"""
+        self.history.append({"user": prompt, "assistant": reply})
+        if self.memory:
+            self.memory.add(prompt, reply)
+    
+    def stream_openai(self, prompt: str, messages: Optional[list] = None):
+        """Stream response tokens from OpenAI (server-sent events), raises on failure"""
+        headers = {
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        }
+        
+        data = {
+            "model": OPENAI_MODEL,
+            "messages": messages or self._build_messages(prompt),
+            "max_tokens": MAX_TOKENS,
+            "temperature": TEMP,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        
+        with self.http.post("openai", OPENAI_URL, headers=headers, json=data, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
             
-            reply = response['message']['content'].strip()
-            self.history.append({"user": prompt, "assistant": reply})
-            return reply
-        except Exception as e:
-            print(f"❌ Ollama error: {e}")
-            return "Something went wrong with Ollama. Is it running?"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                payload = line[len("data: "):]
+                if payload == "[DONE]":
+                    break
+                chunk = json.loads(payload)
+                if chunk.get('usage'):
+                    self._prompt_metrics(chunk)
+                if not chunk.get('choices'):  # The usage chunk comes last, with no choices
+                    continue
+                token = chunk['choices'][0]['delta'].get('content')
+                if token:
+                    yield token
     
-    def ask(self, prompt: str) -> str:
-        """Get AI response"""
+    def stream_ollama(self, prompt: str, messages: Optional[list] = None):
+        """Stream response tokens from Ollama, raises on failure"""
+        for chunk in ollama.chat(
+            model=OLLAMA_MODEL,
+            messages=messages or self._build_messages(prompt),
+            options=self.ollama_options,
+            keep_alive=OLLAMA_KEEP_ALIVE,
+            stream=True
+        ):
+            if chunk.get('done'):
+                self._prompt_metrics(chunk)
+            token = chunk['message']['content']
+            if token:
+                yield token
+    
+    def _backend_stream(self, name: str, prompt: str, messages: list):
+        return self.stream_openai(prompt, messages) if name == "openai" else self.stream_ollama(prompt, messages)
+    
+    def stream_reply(self, prompt: str):
+        """Tokens from the best backend right now, with fallback and optional hedging; the reply
+        (or the part said before a barge-in) is remembered, error messages aren't"""
+        reply = ""
+        try:
+            for token in self._routed_tokens(prompt):
+                reply += token
+                yield token
+        except GeneratorExit:
+            if reply.strip():
+                self._remember(prompt, reply.strip())
+            raise
+        except BackendUnavailable:
+            self.reply_source = "error"
+            if not reply:
+                yield "Something went wrong with the AI. Is Ollama running, or is the internet down?"
+                return
+        
+        if reply.strip():
+            self._remember(prompt, reply.strip())
+    
+    def _routed_tokens(self, prompt: str):
+        """Try backends in the router's order, falling back to the next one if a backend fails before its first token.
+        The context is gathered once, every backend gets the same messages"""
+        messages = self._build_messages(prompt)
+        order = self.router.order()
+        if BACKEND_HEDGE_MS is not None and len(order) > 1 and self.router.healthy(order[1]):
+            yield from self._hedged_tokens(prompt, messages, order[0], order[1])
+            return
+        
+        for i, name in enumerate(order):
+            start = time.perf_counter()
+            said = False
+            try:
+                for token in self._backend_stream(name, prompt, messages):
+                    if not said:
+                        self.router.record(name, True, time.perf_counter() - start)
+                        self.reply_source, said = name, True
+                    yield token
+                if not said:
+                    self.router.record(name, True, time.perf_counter() - start)
+                    self.reply_source = name
+                return
+            except Exception as e:
+                print(f"❌ {name} error: {e}")
+                if said:
+                    return  # Can't restart mid-sentence on another backend, keep what was said
+                self.router.record(name, False)
+                if i + 1 < len(order):
+                    metrics.inc(f"{order[i + 1]}_fallbacks")
+                    print(f"   ⚠️ Falling back to {order[i + 1]}...")
+        raise BackendUnavailable()
+    
+    def _hedged_tokens(self, prompt: str, messages: list, primary: str, backup: str):
+        """Start the primary backend; if it has no first token after BACKEND_HEDGE_MS (or fails),
+        start the backup too and stream whichever answers first. The other one is closed."""
+        events = queue.Queue()  # (name, token, error), token None = stream ended
+        stops = {primary: threading.Event(), backup: threading.Event()}
+        
+        def pump(name):
+            # Each pump records its own backend's outcome, so a hedge loser still counts towards order()
+            started, first_token = time.perf_counter(), None
+            tokens = self._backend_stream(name, prompt, messages)
+            try:
+                for token in tokens:
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                        self.router.record(name, True, first_token)
+                    if stops[name].is_set():
+                        return
+                    events.put((name, token, None))
+            except Exception as e:
+                if first_token is None:
+                    self.router.record(name, False)
+                events.put((name, None, e))
+                return
+            finally:
+                tokens.close()
+            if first_token is None:  # Ended without a token
+                self.router.record(name, True, time.perf_counter() - started)
+            events.put((name, None, None))
+        
+        def launch(name):
+            running.add(name)
+            threading.Thread(target=contextvars.copy_context().run, args=(pump, name), daemon=True).start()
+        
+        running, winner = set(), None
+        launch(primary)
+        try:
+            try:
+                event = events.get(timeout=BACKEND_HEDGE_MS / 1000)
+            except queue.Empty:
+                event = None
+                metrics.inc("hedged_requests")
+                print(f"   ⏩ No first token from {primary} after {BACKEND_HEDGE_MS}ms, racing {backup}")
+                launch(backup)
+            
+            while True:
+                name, token, error = event or events.get()
+                event = None
+                
+                if winner is None:
+                    if token is None:  # Failed (or ended empty) before saying anything
+                        if error:
+                            print(f"❌ {name} error: {error}")
+                        running.discard(name)
+                        if error and backup not in running and name == primary:
+                            metrics.inc(f"{backup}_fallbacks")
+                            launch(backup)
+                        if not running:
+                            if error:
+                                raise BackendUnavailable()
+                            return
+                        continue
+                    winner = self.reply_source = name
+                    for other in running - {name}:
+                        stops[other].set()
+                        metrics.inc(f"hedge_wins_{name}")
+                    yield token
+                elif name == winner:
+                    if error:
+                        print(f"❌ {name} error: {error}")
+                        return
+                    if token is None:
+                        return
+                    yield token
+        finally:
+            for stop in stops.values():
+                stop.set()
+    
+    def _quick_response(self, prompt: str) -> Optional[str]:
+        """Commands and custom responses that don't need the AI"""
         command_response = self.handle_command(prompt)
         if command_response:
             return command_response
@@ -824,134 +2672,279 @@ class VoiceAssistant:
             if trigger in p:
                 return resp
         
-        print(f"🤔 Thinking... ({self.ai_mode})")
+        return None
+    
+    def _response_key(self, prompt: str):
+        """(cache key, ttl) for a prompt, or None if its reply depends on the conversation so far"""
+        text = normalize_prompt(prompt)
+        if self.history and FOLLOW_UP_RE.search(text):
+            self.response_cache.bypass()
+            return None
         
-        if self.use_openai:
-            return self.ask_openai(prompt)
+        weather = self._weather_context(prompt)
+        ttl = (FORECAST_TTL if "Forecast" in weather else WEATHER_TTL) if weather else RESPONSE_CACHE_TTL
+        if TIME_WORDS_RE.search(text):
+            bucket, ttl = datetime.now().strftime("%Y-%m-%d %H:%M"), min(ttl, RESPONSE_TIME_TTL)
         else:
-            return self.ask_ollama(prompt)
+            bucket = datetime.now().strftime("%Y-%m-%d")
+        
+        # Pending alarms/timers and the past turns go into the prompt too, a reply about them mustn't outlive them
+        alarms = self._alarms_context(prompt)
+        turns = self._memory_context(prompt)
+        
+        model = OPENAI_MODEL if self.use_openai else OLLAMA_MODEL
+        fingerprint = hashlib.sha1(f"{model}|{bucket}|{weather}|{alarms}|{turns}|{SYSTEM_PROMPT}".encode()).hexdigest()[:16]
+        return f"{text}|{fingerprint}", ttl
+    
+    def _cached_reply(self, prompt: str):
+        """(cached reply or None, (key, ttl) to store the fresh reply under, or None)"""
+        if not self.response_cache:
+            return None, None
+        cache_key = self._response_key(prompt)
+        if cache_key is None:
+            return None, None
+        
+        reply = self.response_cache.get(cache_key[0])
+        if reply:
+            print("💾 Cached reply")
+            self._remember(prompt, reply)
+        return reply, cache_key
+    
+    def _store_reply(self, prompt: str, cache_key, last_entry):
+        """Cache the reply the backend just added to history (error replies never get there)"""
+        if cache_key and self.history and self.history[-1] is not last_entry and self.history[-1]["user"] == prompt:
+            self.response_cache.put(cache_key[0], self.history[-1]["assistant"], cache_key[1])
+    
+    def ask(self, prompt: str) -> str:
+        """Get AI response"""
+        quick = self._quick_response(prompt)
+        if quick:
+            self.reply_source = "command"
+            return quick
+        
+        cached, cache_key = self._cached_reply(prompt)
+        if cached:
+            self.reply_source = "cache"
+            return cached
+        
+        print(f"🤔 Thinking... ({self.ai_mode})")
+        last_entry = self.history[-1] if self.history else None
+        
+        with metrics.span("llm"):
+            reply = "".join(self.stream_reply(prompt)).strip()
+        self._store_reply(prompt, cache_key, last_entry)
+        return reply
+    
+    def ask_stream(self, prompt: str):
+        """Get AI response as a stream of tokens"""
+        quick = self._quick_response(prompt)
+        if quick:
+            self.reply_source = "command"
+            yield quick
+            return
+        
+        cached, cache_key = self._cached_reply(prompt)
+        if cached:
+            self.reply_source = "cache"
+            yield cached
+            return
+        
+        print(f"🤔 Thinking... ({self.ai_mode})")
+        last_entry = self.history[-1] if self.history else None
+        
+        yield from self._llm_metrics(self.stream_reply(prompt))
+        self._store_reply(prompt, cache_key, last_entry)
+    
+    def _llm_metrics(self, tokens):
+        """Pass a token stream through, recording time to first token and total generation time"""
+        start = time.perf_counter()
+        first = True
+        try:
+            for token in tokens:
+                if first:
+                    metrics.observe("llm_first_token", time.perf_counter() - start)
+                    first = False
+                yield token
+        finally:
+            metrics.observe("llm", time.perf_counter() - start)
+    
+    @staticmethod
+    def _cut_sentences(buf: str) -> tuple:
+        """([complete sentences], unfinished rest) of the text streamed so far"""
+        *parts, rest = SENTENCE_END.split(buf)
+        return [sentence.strip() for sentence in parts if sentence.strip()], rest
+    
+    def _sentences(self, tokens):
+        """Cut a token stream into sentences as soon as each one is complete"""
+        buf = ""
+        for token in tokens:
+            sentences, buf = self._cut_sentences(buf + token)
+            yield from sentences
+        
+        if buf.strip():
+            yield buf.strip()
+    
+    def _set_speaking(self, speaking: bool):
+        self.speaking = speaking
+    
+    def _start_reply(self):
+        """Drop leftovers of a reply that was barged in on before queueing a new one"""
+        if self.interrupt.is_set():
+            self.tts.cancel()
+            self.interrupt.clear()
     
-    def speak(self, text: str):
-        """Text to speech with immediate interrupt capability"""
+    def speak(self, text: str, wait: bool = False) -> Optional[threading.Event]:
+        """Queue text for speech and return immediately with a wait handle (or block if wait=True)"""
         print(f"💬 Arthur: {text}")
         
         if not self.voice_mode:
-            return
+            return None
         
-        self.speaking = True
-        self.interrupt.clear()
+        self._start_reply()
+        done = self.tts.say(text)
+        if wait:
+            done.wait()
+        return done
+    
+    async def speak_async(self, text: str):
+        """speak() and wait until it has been said, without blocking the event loop"""
+        done = self.speak(text)
+        if done:
+            await in_thread(done.wait)
+    
+    async def reply_async(self, prompt: str) -> Optional[threading.Event]:
+        """Answer a prompt out loud (streamed or whole, depending on STREAM_REPLIES). The LLM stream
+        runs on a worker thread and each sentence is queued for speech as soon as it is complete.
+        Cancelling the task closes the stream and drops queued speech."""
+        if not STREAM_REPLIES:
+            return self.speak(await in_thread(self.ask, prompt))
+        
+        print("💬 Arthur: ", end="", flush=True)
+        if self.voice_mode:
+            self._start_reply()
         
+        tokens = iterate_in_thread(self.ask_stream(prompt))
+        done, buf = None, ""
         try:
-            engine = pyttsx3.init()
-            engine.setProperty('rate', VOICE_RATE)
-            engine.setProperty('volume', 1.0)
-            
-            voices = engine.getProperty('voices')
-            if voices:
-                engine.setProperty('voice', voices[0].id)
-            
-            # Split text into sentences for interruptible speech
-            sentences = text.replace('!', '.').replace('?', '.').split('.')
-            sentences = [s.strip() for s in sentences if s.strip()]
-            
-            for sentence in sentences:
-                if self.interrupt.is_set():
-                    print("   ⚠️ Interrupted!")
-                    engine.stop()
-                    break
-                
-                engine.say(sentence)
-                engine.runAndWait()
-            
-            del engine
-            
-        except Exception as e:
-            print(f"❌ TTS error: {e}")
+            async for token in tokens:
+                print(token, end="", flush=True)
+                sentences, buf = self._cut_sentences(buf + token)
+                for sentence in sentences:
+                    if self.voice_mode:
+                        done = self.tts.say(sentence)
+            if buf.strip() and self.voice_mode:
+                done = self.tts.say(buf.strip())
+        except asyncio.CancelledError:
+            if self.tts:
+                self.tts.cancel()
+            raise
         finally:
-            self.speaking = False
+            print()
+            await tokens.aclose()
+        return done
+    
+    async def voice_turn(self, wake_pos: int):
+        """One voice turn: record and transcribe on a worker thread, then reply. Cancelled on barge-in"""
+        self.interrupt.clear()
+        
+        if self.stt_error:
+            print(f"❌ Speech recognition unavailable: {self.stt_error}")
+            self.stt_error = None
+            threading.Thread(target=self._load_stt, daemon=True).start()
+            await self.speak_async("Speech recognition failed to load. Trying again, give me a minute.")
+            return
+        
+        if not self.stt_ready.is_set():
+            await self.speak_async("Still warming up, give me a sec.")
+            return
+        
+        # Start recording immediately after wake word
+        metrics.new_turn()
+        audio, cmd = await in_thread(self.listen, wake_pos)
+        if audio is not None:
+            if cmd and len(cmd.strip()) > 2:
+                print(f"🗣️ You: {cmd}")
+                with metrics.span("reply"):
+                    done = await self.reply_async(cmd)
+                if done:
+                    await in_thread(done.wait)  # Stay cancellable until the reply has been spoken
+            else:
+                await self.speak_async("I didn't catch that.")
+        else:
+            await self.speak_async("Recording issue. Try again.")
+        
+        print(f"\n🎙️ Ready... ({len(self.history)} in memory)")
     
-    def run_text_mode(self):
+    async def run_text_mode(self):
         """Text-only interaction loop"""
+        self.loop = asyncio.get_running_loop()
         print("💬 Type your messages below (Ctrl+C to exit)\n")
         print("📝 Commands: 'set alarm for 7:30 AM', 'set timer for 5 minutes', 'what's the weather', 'clear history'\n")
         
-        try:
-            while True:
-                try:
-                    user_input = input("You: ").strip()
-                    
-                    if not user_input:
-                        continue
-                    
-                    if user_input.lower() in ['exit', 'quit', 'bye']:
-                        print("👋 Goodbye!")
-                        break
-                    
-                    response = self.ask(user_input)
-                    self.speak(response)
-                    print(f"({len(self.history)} in memory)\n")
-                    
-                except EOFError:
-                    break
-        except KeyboardInterrupt:
-            print("\n🛑 Shutting down...")
+        while True:
+            try:
+                user_input = (await in_thread(input, "You: ")).strip()
+            except EOFError:
+                break
+            
+            if not user_input:
+                continue
+            
+            if user_input.lower() in ['exit', 'quit', 'bye']:
+                print("👋 Goodbye!")
+                break
+            
+            metrics.new_turn()
+            with metrics.span("turn"):
+                await self.reply_async(user_input)
+            print(f"({len(self.history)} in memory)\n")
     
-    def run_voice_mode(self):
-        """Voice interaction loop"""
+    async def run_voice_mode(self):
+        """Voice interaction loop: wake words arrive on an asyncio queue, each starts a turn task"""
+        self.loop = asyncio.get_running_loop()
+        self.wake_events = asyncio.Queue()
         threading.Thread(target=self.monitor_wake_word, daemon=True).start()
         print("🎙️ Say 'Hey Arthur' to begin.\n")
         
-        try:
-            while True:
-                try:
-                    self.wake_queue.get(timeout=0.1)
-                    
-                    # Clear queue
-                    while not self.wake_queue.empty():
-                        self.wake_queue.get_nowait()
-                    
-                    # If speaking, interrupt immediately and start listening
-                    if self.speaking:
-                        self.interrupt.set()
-                        print("\n⚠️ INTERRUPT! Starting new command...")
-                        time.sleep(0.1)  # Brief pause to stop speech
-                    
-                    self.interrupt.clear()
-                    
-                    # Start recording immediately after wake word
-                    audio = self.record()
-                    if audio:
-                        cmd = self.transcribe(audio)
-                        if cmd and len(cmd.strip()) > 2:
-                            print(f"🗣️ You: {cmd}")
-                            self.speak(self.ask(cmd))
-                            try:
-                                os.remove(audio)
-                            except:
-                                pass
-                        else:
-                            self.speak("I didn't catch that.")
-                    else:
-                        self.speak("Recording issue. Try again.")
-                    
-                    print(f"\n🎙️ Ready... ({len(self.history)} in memory)")
-                except queue.Empty:
-                    continue
-        except KeyboardInterrupt:
-            print("\n🛑 Shutting down...")
+        while True:
+            wake_pos = await self.wake_events.get()
+            
+            # Clear queue, keeping the latest detection
+            while not self.wake_events.empty():
+                wake_pos = self.wake_events.get_nowait()
+            
+            # Barge-in: cancel the running turn (closes the LLM stream, drops queued speech) and start listening
+            if self.turn and not self.turn.done():
+                self.turn.cancel()
+                if self.tts:
+                    self.tts.cancel()
+                print("\n⚠️ INTERRUPT! Starting new command...")
+            
+            self.turn = asyncio.create_task(self.voice_turn(wake_pos))
     
     def run(self):
         """Main loop"""
         try:
-            if self.voice_mode:
-                self.run_voice_mode()
-            else:
-                self.run_text_mode()
+            if SERVER_MODE:
+                return ArthurServer(self).serve()
+            asyncio.run(self.run_voice_mode() if self.voice_mode else self.run_text_mode())
+        except KeyboardInterrupt:
+            print("\n🛑 Shutting down...")
         finally:
             self.cleanup()
     
     def cleanup(self):
         """Cleanup"""
+        self.running = False
+        metrics.export()
+        if self.memory:
+            self.memory.close()
+        if self.response_cache:
+            print(f"💾 Response cache: {self.response_cache.summary()}")
+        if self.tts:
+            if self.tts.cache:
+                print(f"🔊 Speech cache: {self.tts.cache.summary()}")
+            self.tts.shutdown()
         if self.voice_mode and self.stream:
             self.stream.stop_stream()
             self.stream.close()
@@ -961,6 +2954,213 @@ class VoiceAssistant:
             self.porcupine.delete()
         print("👋 Goodbye!")
 
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+# 🖧 SERVER MODE
+# ════════════════════════════════════════════════════════════════════════════════════════════════════
+class Session:
+    """One server client: its own conversation and timers on top of the shared assistant"""
+    
+    def __init__(self, session_id: str, assistant: VoiceAssistant):
+        self.id = session_id
+        self.assistant = assistant.new_session(session_id)
+        self.lock = threading.Lock()  # One request at a time per session (a second gets 409), so history stays in order
+        self.events = deque(maxlen=50)  # Fired alarms/timers waiting to be fetched
+        self.last_used = time.time()
+
+class ArthurServer:
+    """Local HTTP API over one VoiceAssistant (backends, HTTP pool, weather and response caches shared).
+    
+    Requests run on the HTTP server's connection threads, but only SERVER_WORKERS at a time. Up to
+    SERVER_QUEUE_LIMIT more wait for a worker, anything beyond that (or waiting longer than
+    SERVER_QUEUE_TIMEOUT) gets a 503 straight away instead of piling up behind the LLM. An ask on a
+    session that already has one running gets a 409 rather than waiting outside admission control."""
+    
+    def __init__(self, assistant: VoiceAssistant, host: str = SERVER_HOST, port: int = SERVER_PORT):
+        self.assistant = assistant
+        self.sessions = {}  # id -> Session
+        self.lock = threading.Lock()
+        self.workers = threading.Semaphore(SERVER_WORKERS)
+        self.admitted = 0  # Requests running or waiting for a worker
+        assistant.server = self
+        handler = type("BoundArthurRequestHandler", (ArthurRequestHandler,), {"app": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+    
+    def serve(self):
+        host, port = self.httpd.server_address[:2]
+        print(f"🖧 Serving on http://{host}:{port} ({SERVER_WORKERS} workers, queue {SERVER_QUEUE_LIMIT})")
+        self.httpd.serve_forever()
+    
+    def session(self, session_id: Optional[str] = None) -> Session:
+        """Existing session, or a new one (with a fresh id if none was given)"""
+        with self.lock:
+            session = self.sessions.get(session_id) if session_id else None
+            if session is None:
+                self._expire_idle()
+                session_id = session_id or os.urandom(8).hex()
+                session = self.sessions[session_id] = Session(session_id, self.assistant)
+                metrics.inc("server_sessions")
+            session.last_used = time.time()
+            return session
+    
+    def close_session(self, session_id: str) -> bool:
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session:
+            session.assistant.scheduler.clear_all()
+        return session is not None
+    
+    def notify(self, session_id: str, kind: str, label: str):
+        """A session's alarm/timer fired (called by the assistant's announcer thread)"""
+        with self.lock:
+            session = self.sessions.get(session_id)
+        if session:
+            session.events.append({"kind": kind, "label": label, "at": round(time.time(), 3)})
+    
+    def acquire(self) -> Optional[float]:
+        """Admission control: wait for a worker, returns the seconds waited, None if the queue is full or the wait times out"""
+        with self.lock:
+            if self.admitted >= SERVER_WORKERS + SERVER_QUEUE_LIMIT:
+                metrics.inc("server_rejected")
+                return None
+            self.admitted += 1
+        
+        start = time.perf_counter()
+        if self.workers.acquire(timeout=SERVER_QUEUE_TIMEOUT):
+            return time.perf_counter() - start
+        with self.lock:
+            self.admitted -= 1
+        metrics.inc("server_timeouts")
+        return None
+    
+    def release(self):
+        self.workers.release()
+        with self.lock:
+            self.admitted -= 1
+    
+    def health(self) -> dict:
+        with self.lock:
+            return {"sessions": len(self.sessions), "admitted": self.admitted, "workers": SERVER_WORKERS,
+                    "queue_limit": SERVER_QUEUE_LIMIT, "backend": self.assistant.ai_mode,
+                    "backends": self.assistant.router.summary()}
+    
+    def _expire_idle(self):
+        cutoff = time.time() - SERVER_SESSION_IDLE
+        for session_id in [sid for sid, s in self.sessions.items() if s.last_used < cutoff]:
+            self.sessions.pop(session_id).assistant.scheduler.clear_all()
+
+class ArthurRequestHandler(BaseHTTPRequestHandler):
+    """POST /sessions, POST /sessions/<id>/ask, GET /sessions/<id>/events, DELETE /sessions/<id>, GET /health"""
+    protocol_version = "HTTP/1.1"
+    app = None  # ArthurServer, bound per server
+    
+    def log_message(self, *args):
+        pass
+    
+    def _send_json(self, payload, status: int = 200, headers: Optional[dict] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+    
+    def _route(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        return parts + [""] * (3 - len(parts))
+    
+    def do_GET(self):
+        root, session_id, action = self._route()
+        if root == "health":
+            self._send_json(self.app.health())
+        elif root == "sessions" and action == "events":
+            session = self.app.sessions.get(session_id)
+            if session is None:
+                return self._send_json({"error": "unknown session"}, 404)
+            events = [session.events.popleft() for _ in range(len(session.events))]
+            self._send_json({"session": session_id, "events": events})
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def do_DELETE(self):
+        root, session_id, _ = self._route()
+        if root == "sessions" and session_id and self.app.close_session(session_id):
+            self._send_json({"session": session_id, "closed": True})
+        else:
+            self._send_json({"error": "unknown session"}, 404)
+    
+    def do_POST(self):
+        root, session_id, action = self._route()
+        request = self._read_json()
+        
+        if root == "sessions" and not session_id:
+            session = self.app.session()
+            return self._send_json({"session": session.id}, 201)
+        if root != "sessions" or action != "ask":
+            return self._send_json({"error": "not found"}, 404)
+        
+        prompt = str(request.get("prompt", "")).strip()
+        if not prompt:
+            return self._send_json({"error": "prompt is required"}, 400)
+        
+        session = self.app.session(session_id)
+        if not session.lock.acquire(blocking=False):
+            metrics.inc("server_conflicts")
+            return self._send_json({"error": "session already has a request running"}, 409, {"Retry-After": "1"})
+        try:
+            waited = self.app.acquire()
+            if waited is None:
+                return self._send_json({"error": "busy, try again"}, 503, {"Retry-After": "1"})
+            try:
+                metrics.new_turn()  # Only admitted requests count as turns
+                metrics.observe("server_queue", waited)
+                metrics.inc("server_requests")
+                with metrics.span("server_ask"):
+                    if request.get("stream"):
+                        self._stream_reply(session, prompt)
+                    else:
+                        start = time.perf_counter()
+                        reply = session.assistant.ask(prompt)
+                        self._send_json({"session": session.id, "reply": reply, "backend": session.assistant.reply_source,
+                                         "ms": round((time.perf_counter() - start) * 1000, 1)})
+            finally:
+                self.app.release()
+        finally:
+            session.lock.release()
+    
+    def _stream_reply(self, session: Session, prompt: str):
+        """Server-sent events: data: {"token": ...} per token, then data: {"done": true, ...}"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        
+        start = time.perf_counter()
+        tokens = session.assistant.ask_stream(prompt)
+        try:
+            for token in tokens:
+                self._chunk(f"data: {json.dumps({'token': token})}\n\n")
+            self._chunk(f"data: {json.dumps({'done': True, 'backend': session.assistant.reply_source, 'ms': round((time.perf_counter() - start) * 1000, 1)})}\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):  # Client went away, stop generating
+            tokens.close()
+            self.close_connection = True
+    
+    def _chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
 # ════════════════════════════════════════════════════════════════════════════════════════════════════
 # 🚀 START
 # ════════════════════════════════════════════════════════════════════════════════════════════════════
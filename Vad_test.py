@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from Test_Room_Ai import EnergyVAD, wav_chunks, CHUNK, SAMPLE_RATE, SILENCE_THRESH, SILENCE_TIME, MIN_SPEECH
+
+# Usage: python Vad_test.py recording.wav [more.wav | folder_of_wavs ...]
+# Fixtures must be 16-bit mono 16 kHz WAVs (DEBUG_SAVE_WAV in Test_Room_Ai.py writes exactly that).
+
+CHUNK_SECS = CHUNK / SAMPLE_RATE
+
+
+def fixed_threshold_endpoint(path):
+    """The old record() rule: RMS > SILENCE_THRESH, stop after SILENCE_TIME of silence"""
+    silence_cnt, speech_cnt, speaking = 0, 0, False
+    max_silence = int(SILENCE_TIME * SAMPLE_RATE / CHUNK)
+    min_speech = int(MIN_SPEECH * SAMPLE_RATE / CHUNK)
+    for i, pcm in enumerate(wav_chunks(path)):
+        rms = np.sqrt(np.mean(np.square(pcm.astype(np.float32))))
+        if rms > SILENCE_THRESH:
+            speech_cnt += 1
+            silence_cnt = 0
+            speaking = speaking or speech_cnt >= 2
+        else:
+            silence_cnt += 1
+        if speaking and speech_cnt >= min_speech and silence_cnt > max_silence:
+            return (i + 1) * CHUNK_SECS, silence_cnt * CHUNK_SECS
+    return None, None
+
+
+def adaptive_endpoint(path):
+    vad = EnergyVAD()
+    for i, pcm in enumerate(wav_chunks(path)):
+        if vad.update(pcm):
+            return (i + 1) * CHUNK_SECS, vad.endpoint_latency
+    return None, None
+
+
+def fmt(value):
+    return f"{value:6.2f}s" if value is not None else "  never"
+
+
+files = []
+for arg in sys.argv[1:]:
+    p = Path(arg)
+    files += sorted(p.glob("*.wav")) if p.is_dir() else [p]
+
+if not files:
+    print("Usage: python Vad_test.py recording.wav [more.wav | folder ...]")
+    sys.exit(1)
+
+print("🎚️ VAD / Endpointing Test\n")
+print("=" * 78)
+print(f"\n{'fixture':<30} {'old stop':>9} {'old latency':>12} {'new stop':>9} {'new latency':>12}\n")
+
+old_latencies, new_latencies = [], []
+for path in files:
+    old_stop, old_latency = fixed_threshold_endpoint(path)
+    new_stop, new_latency = adaptive_endpoint(path)
+    if old_latency is not None:
+        old_latencies.append(old_latency)
+    if new_latency is not None:
+        new_latencies.append(new_latency)
+    print(f"{path.name[:28]:<30} {fmt(old_stop):>9} {fmt(old_latency):>12} {fmt(new_stop):>9} {fmt(new_latency):>12}")
+
+print("\n" + "=" * 78)
+print(f"\n📊 Endpointed: old {len(old_latencies)}/{len(files)}, new {len(new_latencies)}/{len(files)}")
+if old_latencies and new_latencies:
+    print(f"   Mean endpoint latency: old {np.mean(old_latencies):.2f}s, new {np.mean(new_latencies):.2f}s")
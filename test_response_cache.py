@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from Mock_llm import start_mock_server
+
+# Regression tests for the response cache, against Mock_llm.py. Run with: python -m pytest -q test_response_cache.py
+# (a bare pytest would also pick up the Audio_test.py/Vad_test.py scripts, which need a mic)
+
+mock, mock_url = start_mock_server(first_token_ms=5, tokens_per_sec=2000)
+os.environ["OLLAMA_HOST"] = mock_url
+os.environ.pop("OPENAI_API_KEY", None)
+
+import Test_Room_Ai as arthur
+
+
+@pytest.fixture
+def assistant(tmp_path, monkeypatch):
+    monkeypatch.setattr(arthur, "VOICE_MODE", False)
+    monkeypatch.setattr(arthur, "MEMORY_ENABLED", False)
+    monkeypatch.setattr(arthur, "RESPONSE_CACHE", True)
+    app = arthur.VoiceAssistant()
+    app.response_cache = arthur.ResponseCache(str(tmp_path / "response_cache.json"))
+    session = app.new_session("test")
+    yield session
+    session.scheduler.clear_all()  # Timers the test set must not fire later
+
+
+def test_same_prompt_and_context_is_served_from_cache(assistant):
+    assistant.ask("tell me a joke")
+    assistant.ask("clear history")
+    assistant.ask("tell me a joke")
+    assert assistant.reply_source == "cache"
+
+
+def test_timer_reply_not_reused_after_the_timer_is_gone(assistant):
+    assistant.ask("set a timer for 10 minutes for pizza")
+    assistant.ask("clear history")
+    assistant.ask("how long until the pizza is done")
+    assert assistant.reply_source == "ollama"
+
+    assistant.ask("cancel all timers")
+    assistant.ask("clear history")
+    assistant.ask("how long until the pizza is done")
+    assert assistant.reply_source != "cache"